@@ -0,0 +1,70 @@
+"""
+Finance calculations: scalar formulas, vectorized batches and the engines built on them.
+
+Submodules are imported on first attribute access, so `import financecalculationbot` stays
+cheap and NumPy, pyarrow and multiprocessing are only loaded by the features that use them.
+"""
+import importlib
+
+__version__ = "0.2.0"
+
+# Public name -> submodule that defines it
+_EXPORTS = {
+    "FinanceCalculations": "calculations",
+    "FinanceImplementations": "calculations",
+    "run_demos": "calculations",
+    "ErrorCode": "validation",
+    "InvalidInputError": "validation",
+    "DiscountFactorCache": "discount_cache",
+    "ExactArithmetic": "exact",
+    "VectorizedFinanceCalculations": "vectorized",
+    "AnnuityEngine": "annuity_engine",
+    "AnnuityFactors": "annuity_engine",
+    "AnnuityResults": "annuity_engine",
+    "ValuationPipeline": "pipeline",
+    "ParallelExecutor": "parallel",
+    "RateSolver": "solvers",
+    "Instrumentation": "instrumentation",
+    "ValuationService": "service",
+    "MonteCarloSimulation": "monte_carlo",
+    "StreamingSummary": "monte_carlo",
+    "AmortizationSchedule": "amortization",
+    "AmortizationScheduleGenerator": "amortization",
+    "SensitivityEngine": "sensitivity",
+    "Sensitivities": "sensitivity",
+    "YieldCurve": "yield_curve",
+    "IncrementalValuation": "incremental",
+    "Factor": "incremental",
+    "CashFlowEngine": "cashflows",
+    "CashFlowLedger": "cashflows",
+    "year_fraction": "cashflows",
+    "ScenarioEngine": "scenarios",
+    "ScenarioSet": "scenarios",
+    "ScenarioAggregates": "scenarios",
+    "PersistentResultCache": "result_cache",
+    "ReturnStream": "returns",
+    "ReturnChunk": "returns",
+    "Instrument": "instruments",
+    "InstrumentArray": "instruments",
+    "SingleCashFlow": "instruments",
+    "Annuity": "instruments",
+    "Perpetuity": "instruments",
+    "PerpetuityStartingToday": "instruments",
+    "GrowingStream": "instruments",
+    "DividendStock": "instruments",
+}
+
+__all__ = ["__version__", *_EXPORTS]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
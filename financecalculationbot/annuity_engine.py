@@ -0,0 +1,179 @@
+from collections import namedtuple
+
+import numpy as np
+
+#Shared-factor annuity engine
+
+AnnuityResults = namedtuple("AnnuityResults", [
+    "present_value",
+    "future_value",
+    "cash_payment_pv",
+    "cash_payment_fv",
+    "number_of_years_pv",
+    "number_of_years_fv",
+])
+
+
+def growing_stream_factor(nominal_rate, growth=0.0, time=np.inf, compounding_frequency=1, due=False, deferral=0.0):
+    """
+    Present value of a stream of payments per unit of first payment, for every combination of
+    growth, timing, deferral and term:
+
+        factor = (1 - ((1 + q) / (1 + i)) ** n) / (i - q) * (1 + i if due) * (1 + i) ** (-deferral * m)
+
+    with i = nominal_rate / m, q = growth / m and n = time * m payments. An infinite term makes the
+    ratio power vanish (a growing perpetuity, valid when nominal_rate > growth), and i == q falls
+    back to n / (1 + i). Level annuities, perpetuities, perpetuities starting today, annuities due
+    and constant-growth DDMs are all special cases, so a mixed portfolio is one broadcast call.
+
+    Parameters:
+    - nominal_rate (array_like): The annual interest rates (as decimals)
+    - growth (array_like): Annual payment growth rates (as decimals), applied per payment period. Default is 0.
+    - time (array_like): Terms in years; np.inf for perpetuities. Default is np.inf.
+    - compounding_frequency (array_like): Payments and compounding periods per year. Default is 1 (annually).
+    - due (array_like): Payments at the start of each period (annuity due) instead of the end. Default is False.
+    - deferral (array_like): Years before the stream starts. Default is 0.
+
+    Returns:
+    ndarray: The factors (no validation; invalid combinations give inf or NaN)
+    """
+    m = np.asarray(compounding_frequency, dtype=np.float64)
+    i = np.asarray(nominal_rate, dtype=np.float64) / m
+    q = np.asarray(growth, dtype=np.float64) / m
+    n = np.asarray(time, dtype=np.float64) * m
+    with np.errstate(all="ignore"):
+        factor = np.where(i == q, n / (1 + i), (1 - ((1 + q) / (1 + i)) ** n) / (i - q))
+        factor = factor * np.where(due, 1 + i, 1.0) * (1 + i) ** (-np.asarray(deferral, dtype=np.float64) * m)
+    return factor
+
+
+class AnnuityFactors:
+    """
+    Compounding factors for a (nominal_rate, compounding_frequency, time) tuple, computed once
+    and shared by all six annuity formulas.
+
+    Arguments are broadcast against each other. time may be omitted when only the
+    number-of-years solvers are needed, since they do not depend on the term.
+    """
+    def __init__(self, nominal_rate, compounding_frequency=1, time=None):
+        self.nominal_rate = np.asarray(nominal_rate, dtype=np.float64)
+        self.compounding_frequency = np.asarray(compounding_frequency, dtype=np.float64)
+        self.periodic_rate = self.nominal_rate / self.compounding_frequency
+        self.log_growth = np.log(1 + self.periodic_rate)
+
+        if time is None:
+            self.time = None
+            self.growth = None
+            self.discount = None
+        else:
+            self.time = np.asarray(time, dtype=np.float64)
+            with np.errstate(all="ignore"):
+                self.growth = (1 + self.periodic_rate) ** (self.time * self.compounding_frequency)
+                self.discount = 1 / self.growth
+
+    def _require_time(self):
+        if self.growth is None:
+            raise ValueError("AnnuityFactors was built without time; term-dependent outputs are unavailable")
+
+    # Present Value of an Annuity
+    def present_value_annuity(self, annual_payment):
+        self._require_time()
+        with np.errstate(all="ignore"):
+            return annual_payment * ((1 - self.discount) / self.periodic_rate)
+
+    # Future Value of an Annuity
+    def future_value_annuity(self, annual_payment):
+        self._require_time()
+        with np.errstate(all="ignore"):
+            return annual_payment * ((self.growth - 1) / self.periodic_rate)
+
+    # Cash Payment of an Annuity (Given PV)
+    def cash_payment_annuity_pv(self, present_value):
+        self._require_time()
+        with np.errstate(all="ignore"):
+            return present_value * self.periodic_rate / (1 - self.discount)
+
+    # Cash Payment of an Annuity (Given FV)
+    def cash_payment_annuity_fv(self, future_value):
+        self._require_time()
+        with np.errstate(all="ignore"):
+            return future_value / ((self.growth - 1) / self.periodic_rate)
+
+    # Number of Years Annuity (Given PV)
+    def number_of_years_annuity_pv(self, present_value, annual_payment):
+        with np.errstate(all="ignore"):
+            return (-np.log(1 - (present_value * self.periodic_rate) / annual_payment) / self.log_growth) / self.compounding_frequency
+
+    # Number of Years Annuity (Given FV)
+    def number_of_years_annuity_fv(self, future_value, annual_payment):
+        with np.errstate(all="ignore"):
+            return (np.log(1 + (future_value * self.periodic_rate) / annual_payment) / self.log_growth) / self.compounding_frequency
+
+
+class AnnuityEngine:
+    """
+    Evaluates every annuity output from one set of AnnuityFactors, and prices whole
+    rate x term grids in a single broadcast call.
+    """
+    def __init__(self):
+        pass
+
+    def evaluate(self, nominal_rate, time, compounding_frequency=1, annual_payment=None, present_value=None, future_value=None):
+        """
+        Calculate all annuity outputs that the supplied amounts allow.
+
+        Parameters:
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - annual_payment (array_like): The payments received each year, needed for present_value, future_value and the number-of-years outputs
+        - present_value (array_like): The present values, needed for cash_payment_pv and number_of_years_pv
+        - future_value (array_like): The future values, needed for cash_payment_fv and number_of_years_fv
+
+        Returns:
+        AnnuityResults: One array per output (None where the required amount was not supplied), NaN where the inputs are invalid
+        """
+        factors = AnnuityFactors(nominal_rate, compounding_frequency, time)
+        base_invalid = (factors.nominal_rate <= 0) | (factors.time <= 0) | (factors.compounding_frequency <= 0)
+        term_invalid = (factors.nominal_rate <= 0) | (factors.compounding_frequency <= 0)
+
+        pv_annuity = fv_annuity = payment_pv = payment_fv = years_pv = years_fv = None
+
+        if annual_payment is not None:
+            annual_payment = np.asarray(annual_payment, dtype=np.float64)
+            pv_annuity = np.where(base_invalid | (annual_payment < 0), np.nan, factors.present_value_annuity(annual_payment))
+            fv_annuity = np.where(base_invalid | (annual_payment <= 0), np.nan, factors.future_value_annuity(annual_payment))
+
+        if present_value is not None:
+            present_value = np.asarray(present_value, dtype=np.float64)
+            payment_pv = np.where(base_invalid | (present_value <= 0), np.nan, factors.cash_payment_annuity_pv(present_value))
+            if annual_payment is not None:
+                years_invalid = term_invalid | (present_value <= 0) | (annual_payment <= 0)
+                years_pv = np.where(years_invalid, np.nan, factors.number_of_years_annuity_pv(present_value, annual_payment))
+
+        if future_value is not None:
+            future_value = np.asarray(future_value, dtype=np.float64)
+            payment_fv = np.where(base_invalid | (future_value <= 0), np.nan, factors.cash_payment_annuity_fv(future_value))
+            if annual_payment is not None:
+                years_invalid = term_invalid | (future_value <= 0) | (annual_payment <= 0)
+                years_fv = np.where(years_invalid, np.nan, factors.number_of_years_annuity_fv(future_value, annual_payment))
+
+        return AnnuityResults(pv_annuity, fv_annuity, payment_pv, payment_fv, years_pv, years_fv)
+
+    def price_grid(self, nominal_rates, times, compounding_frequency=1, annual_payment=None, present_value=None, future_value=None):
+        """
+        Calculate all annuity outputs over a full rate x term grid in one call.
+
+        Parameters:
+        - nominal_rates (array_like): 1-D annual interest rates (as decimals), the grid rows
+        - times (array_like): 1-D time periods in years, the grid columns
+        - compounding_frequency (float): Number of compounding periods per year. Default is 1 (annually).
+        - annual_payment, present_value, future_value: As for evaluate; scalars or arrays broadcastable to the grid
+
+        Returns:
+        AnnuityResults: Arrays of shape (len(nominal_rates), len(times))
+        """
+        nominal_rates = np.asarray(nominal_rates, dtype=np.float64).reshape(-1, 1)
+        times = np.asarray(times, dtype=np.float64).reshape(1, -1)
+        rates, times = np.broadcast_arrays(nominal_rates, times)
+        return self.evaluate(rates, times, compounding_frequency, annual_payment, present_value, future_value)
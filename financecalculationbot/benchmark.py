@@ -0,0 +1,180 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from .calculations import FinanceCalculations, calculation_names
+
+#Benchmark runner for every FinanceCalculations method
+
+DDM_YEARS = 10
+
+# Each case builds valid arguments for n calculations. Multi-stage DDM values a
+# (stocks, DDM_YEARS) dividend matrix, so n // DDM_YEARS stocks are generated to keep
+# its memory in line with the other cases; throughput counts stocks in both modes.
+CASES = {
+    "present_value_single_cashflow": lambda rng, n: (rng.uniform(1, 1e6, n), rng.uniform(0, 0.2, n), rng.uniform(0, 30, n), rng.choice([1, 2, 4, 12, 365], n)),
+    "future_value_single_cashflow": lambda rng, n: (rng.uniform(1, 1e6, n), rng.uniform(0, 0.2, n), rng.uniform(0, 30, n), rng.choice([1, 2, 4, 12, 365], n)),
+    "interest_rate_single_cashflow": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(1e3, 1e6, n), rng.uniform(0.5, 30, n), rng.choice([1, 2, 4, 12, 365], n)),
+    "number_of_years_single_cashflow": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(1e3, 1e6, n), rng.uniform(0.01, 0.2, n), rng.choice([1, 2, 4, 12, 365], n)),
+    "effective_annual_rate": lambda rng, n: (rng.uniform(0, 0.2, n), rng.choice([1, 2, 4, 12, 365], n)),
+    "present_value_perpetuity": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(0.01, 0.2, n)),
+    "pv_perpetuity_starting_today": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(0.01, 0.2, n)),
+    "present_value_annuity": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(0.01, 0.2, n), rng.uniform(1, 30, n), rng.choice([1, 2, 4, 12], n)),
+    "cash_payment_annuity_pv": lambda rng, n: (rng.uniform(1e3, 1e6, n), rng.uniform(0.01, 0.2, n), rng.uniform(1, 30, n), rng.choice([1, 2, 4, 12], n)),
+    "cash_payment_annuity_fv": lambda rng, n: (rng.uniform(1e3, 1e6, n), rng.uniform(0.01, 0.2, n), rng.uniform(1, 30, n), rng.choice([1, 2, 4, 12], n)),
+    "number_of_years_annuity_pv": lambda rng, n: (rng.uniform(100, 500, n), rng.uniform(100, 200, n), rng.uniform(0.01, 0.2, n), rng.choice([1, 2, 4, 12], n)),
+    "number_of_years_annuity_fv": lambda rng, n: (rng.uniform(1e3, 1e6, n), rng.uniform(100, 200, n), rng.uniform(0.01, 0.2, n), rng.choice([1, 2, 4, 12], n)),
+    "future_value_annuity": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(0.01, 0.2, n), rng.uniform(1, 30, n), rng.choice([1, 2, 4, 12], n)),
+    "present_value_growing_stream": lambda rng, n: (rng.uniform(1, 1e3, n), rng.uniform(0.06, 0.2, n), rng.uniform(0, 0.05, n), np.where(rng.random(n) < 0.5, np.inf, rng.uniform(1, 30, n))),
+    "fisher_effect": lambda rng, n: (rng.uniform(0, 0.2, n), rng.uniform(0, 0.1, n)),
+    "dividend_discount_model": lambda rng, n: (rng.uniform(0, 10, n), rng.uniform(0.06, 0.2, n), rng.uniform(0, 0.05, n)),
+    "multi_stage_ddm_with_terminal_value": lambda rng, n: (rng.uniform(0, 10, (max(n // DDM_YEARS, 1), DDM_YEARS)), rng.uniform(0.01, 0.2, max(n // DDM_YEARS, 1)), rng.uniform(10, 100, max(n // DDM_YEARS, 1))),
+    "ddm_no_growth": lambda rng, n: (rng.uniform(0, 10, n), rng.uniform(0.01, 0.2, n)),
+    "ddm_constant_growth": lambda rng, n: (rng.uniform(0, 10, n), rng.uniform(0.06, 0.2, n), rng.uniform(0, 0.05, n), rng.uniform(1, 30, n)),
+    "holding_period_return": lambda rng, n: (rng.uniform(1, 100, n), rng.uniform(0, 100, n), rng.uniform(0, 5, n), rng.integers(0, 12, n)),
+}
+
+DEFAULT_SIZES = ["scalar", "1000", "1000000", "10000000"]
+
+
+def missing_cases():
+    """
+    Returns:
+    list: Public FinanceCalculations methods that have no benchmark case
+    """
+    return sorted(set(calculation_names()) - set(CASES))
+
+
+def _scalar_arguments(arguments):
+    # First row of each generated argument; the multi-stage dividend row stays a list
+    return [row[0].tolist() if row.ndim > 1 else row[0].item() for row in arguments]
+
+
+def _measure(function, calcs, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {"calcs": calcs, "best_seconds": best, "calcs_per_sec": calcs / best if best > 0 else float("inf"), "peak_memory_bytes": peak}
+
+
+def run_case(calculation, size, repeat=3, seed=0, scalar_calls=10_000):
+    """
+    Benchmark one calculation at one size.
+
+    The "scalar" size times scalar_calls consecutive FinanceCalculations calls; numeric sizes
+    time a single batch call over that many rows.
+
+    Returns:
+    dict: calcs, best_seconds, calcs_per_sec and peak_memory_bytes
+    """
+    rng = np.random.default_rng(seed)
+    if size == "scalar":
+        method = getattr(FinanceCalculations(), calculation)
+        arguments = _scalar_arguments(CASES[calculation](rng, DDM_YEARS))
+
+        def function():
+            for _ in range(scalar_calls):
+                method(*arguments)
+
+        return _measure(function, scalar_calls, repeat)
+
+    n = int(size)
+    arguments = CASES[calculation](rng, n)
+    method = getattr(FinanceCalculations().batch, calculation)
+    # One calculation per instrument (row), so batch and scalar calcs/sec share a unit
+    calcs = len(arguments[0])
+    return _measure(lambda: method(*arguments), calcs, repeat)
+
+
+def run(calculations=None, sizes=DEFAULT_SIZES, repeat=3, seed=0):
+    """
+    Benchmark every requested calculation at every size.
+
+    Returns:
+    dict: Environment metadata and a "results" mapping of "calculation[size]" to measurements
+    """
+    calculations = calculations or sorted(CASES)
+    results = {}
+    for calculation in calculations:
+        for size in sizes:
+            key = f"{calculation}[{size}]"
+            results[key] = run_case(calculation, size, repeat, seed)
+            print(f"{key}: {results[key]['calcs_per_sec']:,.0f} calcs/sec, peak {results[key]['peak_memory_bytes'] / 1e6:,.1f} MB", file=sys.stderr)
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+
+def compare(current, baseline, threshold=0.10):
+    """
+    Find cases whose throughput dropped by more than threshold relative to the baseline.
+
+    Parameters:
+    - current (dict): Output of run
+    - baseline (dict): A previously stored output of run
+    - threshold (float): Allowed fractional slowdown. Default is 0.10 (10%).
+
+    Returns:
+    list: (case, baseline calcs/sec, current calcs/sec, fractional change) for every regression
+    """
+    regressions = []
+    for key, measurement in current["results"].items():
+        previous = baseline["results"].get(key)
+        if previous is None:
+            continue
+        change = measurement["calcs_per_sec"] / previous["calcs_per_sec"] - 1
+        if change < -threshold:
+            regressions.append((key, previous["calcs_per_sec"], measurement["calcs_per_sec"], change))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark FinanceCalculations methods at scalar and batch sizes.")
+    parser.add_argument("calculations", nargs="*", help="Methods to benchmark. Default is all of them.")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="'scalar' and/or row counts. Default: %(default)s")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case; the best is kept. Default: %(default)s")
+    parser.add_argument("--output", help="Write the JSON results to this file instead of stdout.")
+    parser.add_argument("--compare", metavar="BASELINE", help="Flag slowdowns against a stored JSON baseline.")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed fractional slowdown in compare mode. Default: %(default)s")
+    args = parser.parse_args(argv)
+
+    missing = missing_cases()
+    if missing:
+        print(f"Warning: no benchmark case for {', '.join(missing)}", file=sys.stderr)
+
+    current = run(args.calculations, args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(current, handle, indent=2)
+    else:
+        print(json.dumps(current, indent=2))
+
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+        regressions = compare(current, baseline, args.threshold)
+        for key, before, after, change in regressions:
+            print(f"REGRESSION {key}: {before:,.0f} -> {after:,.0f} calcs/sec ({change:+.1%})", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,97 @@
 import math
 
+from .discount_cache import DiscountFactorCache
+from .validation import ErrorCode, InvalidInputError, first_error
+
 #Finance Midterm Formulas in Python
 
+# Public FinanceCalculations members that are configuration rather than calculations
+NOT_CALCULATIONS = frozenset({"batch", "enable_discount_cache", "enable_exact_mode"})
+
+
+def calculation_names():
+    """
+    Returns:
+    list: Names of the FinanceCalculations calculation methods, in definition order
+    """
+    return [
+        name for name, member in vars(FinanceCalculations).items()
+        if callable(member) and not name.startswith("_") and name not in NOT_CALCULATIONS
+    ]
+
+
+def _is_curve(nominal_rate):
+    # A YieldCurve (or anything with the same interface) passed in place of a flat rate
+    return hasattr(nominal_rate, "discount_factor")
+
+
 class FinanceCalculations:
-    def __init__(self):
-        pass
+    def __init__(self, raise_on_invalid=False, discount_cache=None, exact=None):
+        """
+        Parameters:
+        - raise_on_invalid (bool): Raise InvalidInputError on invalid inputs instead of returning an "Invalid Input" string. Default is False.
+        - discount_cache (DiscountFactorCache): Optional cache of compounding factors shared by the discounting methods. Default is None (no caching).
+        - exact (ExactArithmetic): Compute cash_payment_annuity_pv, future_value_annuity and present_value_single_cashflow in Decimal. Default is None (float).
+        """
+        self.raise_on_invalid = raise_on_invalid
+        self.discount_cache = discount_cache
+        self.exact = exact
+        self._batch = None
+
+    def enable_discount_cache(self, maxsize=4096):
+        """
+        Turn on discount factor caching for present_value_single_cashflow, present_value_annuity
+        and multi_stage_ddm_with_terminal_value.
+
+        Parameters:
+        - maxsize (int): Maximum number of cached factors. Default is 4096.
+
+        Returns:
+        DiscountFactorCache: The new cache, for inspecting hit/miss counters
+        """
+        self.discount_cache = DiscountFactorCache(maxsize)
+        return self.discount_cache
+
+    def enable_exact_mode(self, context=None, quantum="0.01", rounding=None):
+        """
+        Turn on exact Decimal results for cash_payment_annuity_pv, future_value_annuity and
+        present_value_single_cashflow. The decimal module is only imported here.
+
+        Parameters:
+        - context (decimal.Context): Precision and rounding for intermediate steps. Default is 34 digits, ROUND_HALF_EVEN.
+        - quantum (str): Results are rounded to this exponent; None keeps full precision. Default is "0.01" (cents).
+        - rounding (str): decimal rounding mode for the result, e.g. decimal.ROUND_HALF_UP. Default is ROUND_HALF_EVEN.
+
+        Returns:
+        ExactArithmetic: The Decimal engine now used by this calculator
+        """
+        from .exact import ExactArithmetic
+        if rounding is None:
+            self.exact = ExactArithmetic(context, quantum)
+        else:
+            self.exact = ExactArithmetic(context, quantum, rounding)
+        return self.exact
+
+    def _growth_factor(self, nominal_rate, compounding_frequency, periods):
+        if self.discount_cache is None:
+            return (1 + nominal_rate / compounding_frequency) ** periods
+        return self.discount_cache.growth_factor(nominal_rate, compounding_frequency, periods)
+
+    def _invalid(self, message, code):
+        if self.raise_on_invalid:
+            raise InvalidInputError(message, code)
+        return message
+
+    @property
+    def batch(self):
+        """
+        Vectorized counterpart of this calculator that accepts NumPy arrays for every argument.
+        NumPy is only imported the first time this is accessed.
+        """
+        if self._batch is None:
+            from .vectorized import VectorizedFinanceCalculations
+            self._batch = VectorizedFinanceCalculations()
+        return self._batch
 
     def present_value_single_cashflow(self, future_value, nominal_rate, time, compounding_frequency=1):
         """
@@ -12,17 +99,30 @@ class FinanceCalculations:
         
         Parameters:
         - future_value (float): The future value of the cash flow
-        - nominal_rate (float): The annual interest rate (as a decimal)
+        - nominal_rate (float or YieldCurve): The annual interest rate (as a decimal), or a curve to discount off
         - time (float): The time period in years
-        - compounding_frequency (int): Number of compounding periods per year. Default is 1 (annually).
+        - compounding_frequency (int): Number of compounding periods per year. Default is 1 (annually). Ignored for a curve, which carries its own compounding.
         
         Returns:
         float: The present value
         """
+        if _is_curve(nominal_rate):
+            if future_value < 0 or time < 0:
+                return self._invalid("Invalid Input: Future value and time must be non-negative", first_error(
+                    (future_value < 0, ErrorCode.INVALID_AMOUNT),
+                    (time < 0, ErrorCode.INVALID_TIME)))
+            return future_value * nominal_rate.discount_factor(time)
+
         if future_value < 0 or nominal_rate < 0 or time < 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be non-negative and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be non-negative and compounding_frequency should be greater than 0", first_error(
+                (future_value < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate < 0, ErrorCode.INVALID_RATE),
+                (time < 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
-        return future_value / (1 + nominal_rate / compounding_frequency) ** (time * compounding_frequency)
+        if self.exact is not None:
+            return self.exact.present_value_single_cashflow(future_value, nominal_rate, time, compounding_frequency)
+        return future_value / self._growth_factor(nominal_rate, compounding_frequency, time * compounding_frequency)
 
     # Future Value Single Cash Flow
     def future_value_single_cashflow(self, present_value, nominal_rate, time, compounding_frequency=1):
@@ -39,7 +139,11 @@ class FinanceCalculations:
         float: The future value
         """
         if present_value < 0 or nominal_rate < 0 or time < 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be non-negative and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be non-negative and compounding_frequency should be greater than 0", first_error(
+                (present_value < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate < 0, ErrorCode.INVALID_RATE),
+                (time < 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return present_value * (1 + nominal_rate / compounding_frequency) ** (time * compounding_frequency)
 
@@ -58,7 +162,11 @@ class FinanceCalculations:
         float: The annual interest rate (as a decimal)
         """
         if present_value <= 0 or future_value <= 0 or time <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (time <= 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return ((future_value / present_value) ** (1 / (time * compounding_frequency)) - 1) * compounding_frequency
 
@@ -78,7 +186,11 @@ class FinanceCalculations:
         float: The number of years needed
         """
         if present_value <= 0 or future_value <= 0 or nominal_rate <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return (1 / compounding_frequency) * (math.log(future_value / present_value) / math.log(1 + nominal_rate / compounding_frequency))
 
@@ -96,7 +208,9 @@ class FinanceCalculations:
         float: The effective annual rate (as a decimal)
         """
         if nominal_rate < 0 or compounding_frequency <= 0:
-            return "Invalid Input: Nominal rate must be non-negative and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: Nominal rate must be non-negative and compounding_frequency should be greater than 0", first_error(
+                (nominal_rate < 0, ErrorCode.INVALID_RATE),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return ((1 + nominal_rate / compounding_frequency) ** compounding_frequency) - 1
 
@@ -114,7 +228,9 @@ class FinanceCalculations:
         float: The present value of the perpetuity
         """
         if annual_payment < 0 or nominal_rate <= 0:
-            return "Invalid Input: Annual payment must be non-negative and rate should be greater than 0"
+            return self._invalid("Invalid Input: Annual payment must be non-negative and rate should be greater than 0", first_error(
+                (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE)))
         
         return annual_payment / nominal_rate
 
@@ -131,7 +247,9 @@ class FinanceCalculations:
         float: The present value of the perpetuity starting today
         """
         if annual_payment < 0 or nominal_rate <= 0:
-            return "Invalid Input: Annual payment must be non-negative and rate should be greater than 0"
+            return self._invalid("Invalid Input: Annual payment must be non-negative and rate should be greater than 0", first_error(
+                (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE)))
         
         return annual_payment/nominal_rate + annual_payment
 
@@ -142,17 +260,29 @@ class FinanceCalculations:
         
         Parameters:
         - annual_payment (float): The payment received each year
-        - nominal_rate (float): The annual interest rate (as a decimal)
+        - nominal_rate (float or YieldCurve): The annual interest rate (as a decimal), or a curve to discount each payment off
         - time (float): The time period in years
         - compounding_frequency (int): Number of compounding periods per year. Default is 1 (annually).
         
         Returns:
         float: The present value of the annuity
         """
+        if _is_curve(nominal_rate):
+            if annual_payment < 0 or time <= 0 or compounding_frequency <= 0:
+                return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                    (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+                    (time <= 0, ErrorCode.INVALID_TIME),
+                    (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
+            return annual_payment * nominal_rate.annuity_factor(time, compounding_frequency)
+
         if annual_payment < 0 or nominal_rate <= 0 or time <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (time <= 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
-        return annual_payment * ((1 - (1 / (1 + nominal_rate / compounding_frequency)) ** (time * compounding_frequency)) / (nominal_rate / compounding_frequency))
+        return annual_payment * ((1 - 1 / self._growth_factor(nominal_rate, compounding_frequency, time * compounding_frequency)) / (nominal_rate / compounding_frequency))
 
     # Cash Payment of an Annuity (Given PV)
     def cash_payment_annuity_pv(self, present_value, nominal_rate, time, compounding_frequency=1):
@@ -169,10 +299,16 @@ class FinanceCalculations:
         float: The cash payment of the annuity
         """
         if present_value <= 0 or nominal_rate <= 0 or time <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (time <= 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
-        return (present_value / (1 - (1 / (1 + nominal_rate / compounding_frequency) ** (compounding_frequency * time))) / 
-                (nominal_rate / compounding_frequency))
+        if self.exact is not None:
+            return self.exact.cash_payment_annuity_pv(present_value, nominal_rate, time, compounding_frequency)
+        return (present_value * (nominal_rate / compounding_frequency) / 
+                (1 - (1 / (1 + nominal_rate / compounding_frequency) ** (compounding_frequency * time))))
 
     # Cash Payment of an Annuity (Given FV)
     def cash_payment_annuity_fv(self, future_value, nominal_rate, time, compounding_frequency=1):
@@ -189,7 +325,11 @@ class FinanceCalculations:
         float: The cash payment of the annuity
         """
         if future_value <= 0 or nominal_rate <= 0 or time <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (time <= 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return (future_value / (((1 + nominal_rate / compounding_frequency) ** (time * compounding_frequency) - 1) / (nominal_rate / compounding_frequency)))
 
@@ -208,7 +348,11 @@ class FinanceCalculations:
         float: The number of years for the annuity
         """
         if present_value <= 0 or annual_payment <= 0 or nominal_rate <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (annual_payment <= 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return ((-math.log(1 - (present_value*(nominal_rate / compounding_frequency))/ annual_payment) / 
                 math.log(1 + nominal_rate / compounding_frequency))) * 1/compounding_frequency
@@ -228,7 +372,11 @@ class FinanceCalculations:
         float: The number of years for the annuity
         """
         if future_value <= 0 or annual_payment <= 0 or nominal_rate <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+                (annual_payment <= 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
         
         return ((math.log(1 + (future_value * (nominal_rate / compounding_frequency)) / annual_payment) / 
                 math.log(1 + nominal_rate / compounding_frequency))) * 1 / compounding_frequency
@@ -248,10 +396,54 @@ class FinanceCalculations:
         float: The future value of the annuity
         """
         if annual_payment <= 0 or nominal_rate <= 0 or time <= 0 or compounding_frequency <= 0:
-            return "Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0"
-        
+            return self._invalid("Invalid Input: All inputs must be positive and compounding_frequency should be greater than 0", first_error(
+                (annual_payment <= 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (time <= 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY)))
+        
+        if self.exact is not None:
+            return self.exact.future_value_annuity(annual_payment, nominal_rate, time, compounding_frequency)
         return annual_payment * (((1 + nominal_rate / compounding_frequency) ** (time * compounding_frequency) - 1) / (nominal_rate / compounding_frequency))
 
+    # Present Value of a Growing Annuity or Perpetuity
+    def present_value_growing_stream(self, payment, nominal_rate, growth=0, time=math.inf, compounding_frequency=1, due=False, deferral=0):
+        """
+        Calculate the present value of a growing annuity or perpetuity, ordinary or due, optionally deferred.
+        Level annuities (growth 0), perpetuities (time math.inf) and perpetuities starting today (due) are special cases.
+        
+        Parameters:
+        - payment (float): The first payment
+        - nominal_rate (float): The annual interest rate (as a decimal)
+        - growth (float): The annual payment growth rate (as a decimal), applied per payment period. Default is 0.
+        - time (float): The term in years; math.inf for a perpetuity. Default is math.inf.
+        - compounding_frequency (int): Number of payments and compounding periods per year. Default is 1 (annually).
+        - due (bool): Payments at the start of each period (annuity due). Default is False (end of period).
+        - deferral (float): Years before the first period starts. Default is 0.
+        
+        Returns:
+        float: The present value of the payment stream
+        """
+        if (payment < 0 or nominal_rate <= 0 or growth <= -compounding_frequency or time <= 0
+                or deferral < 0 or compounding_frequency <= 0 or (time == math.inf and nominal_rate <= growth)):
+            return self._invalid("Invalid Input: Payment and deferral must be non-negative, rate and term positive, growth above -100% per period, and a perpetual stream needs a rate above its growth", first_error(
+                (payment < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+                (growth <= -compounding_frequency, ErrorCode.INVALID_RATE),
+                (time <= 0 or deferral < 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY),
+                (time == math.inf and nominal_rate <= growth, ErrorCode.RATE_NOT_ABOVE_GROWTH)))
+        
+        # Same closed form as annuity_engine.growing_stream_factor, kept in pure Python so scalar calls need no NumPy
+        rate, growth_rate = nominal_rate / compounding_frequency, growth / compounding_frequency
+        if rate == growth_rate:
+            factor = time * compounding_frequency / (1 + rate)
+        else:
+            factor = (1 - ((1 + growth_rate) / (1 + rate)) ** (time * compounding_frequency)) / (rate - growth_rate)
+        if due:
+            factor *= 1 + rate
+        return payment * factor / (1 + rate) ** (deferral * compounding_frequency)
+
 
     # Fisher Effect
     def fisher_effect(self, nominal_rate, inflation_rate):
@@ -266,7 +458,9 @@ class FinanceCalculations:
         float: The real interest rate (as a decimal)
         """
         if nominal_rate < 0 or inflation_rate < 0:
-            return "Invalid Input: Both nominal and inflation rates must be non-negative"
+            return self._invalid("Invalid Input: Both nominal and inflation rates must be non-negative", first_error(
+                (nominal_rate < 0, ErrorCode.INVALID_RATE),
+                (inflation_rate < 0, ErrorCode.INVALID_RATE)))
         
         return ((1 + nominal_rate) / (1 + inflation_rate)) - 1
 
@@ -284,7 +478,9 @@ class FinanceCalculations:
         float: The intrinsic value of the stock
         """
         if dividend < 0 or nominal_rate <= growth:
-            return "Invalid Input: Dividend must be non-negative and required rate of return should be greater than growth rate"
+            return self._invalid("Invalid Input: Dividend must be non-negative and required rate of return should be greater than growth rate", first_error(
+                (dividend < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= growth, ErrorCode.RATE_NOT_ABOVE_GROWTH)))
         
         return dividend / (nominal_rate - growth)
 
@@ -295,28 +491,35 @@ class FinanceCalculations:
         
         Parameters:
         - dividends (list): The dividend payments per share for each year
-        - nominal_rate (float): The annual discount rate (as a decimal)
+        - nominal_rate (float or YieldCurve): The annual discount rate (as a decimal), or a curve to discount each year off
         - terminal_value (float): The estimated stock price at the end of the last year
         
         Returns:
         float: The intrinsic value of the stock
         """
+        curve = _is_curve(nominal_rate)
+
         # Validate inputs
-        if nominal_rate <= 0:
-            return "Invalid Input: Discount rate must be greater than 0"
+        if not curve and nominal_rate <= 0:
+            return self._invalid("Invalid Input: Discount rate must be greater than 0", ErrorCode.INVALID_RATE)
         
         if terminal_value <= 0:
-            return "Invalid Input: Terminal value must be greater than 0"
+            return self._invalid("Invalid Input: Terminal value must be greater than 0", ErrorCode.INVALID_AMOUNT)
 
         if not all(x >= 0 for x in dividends):
-            return "Invalid Input: Dividends must be non-negative"
+            return self._invalid("Invalid Input: Dividends must be non-negative", ErrorCode.INVALID_AMOUNT)
+
+        if curve:
+            discount_factors = nominal_rate.discount_factor(range(len(dividends) + 1)).tolist()
+            intrinsic_value = sum(dividend * discount_factors[i + 1] for i, dividend in enumerate(dividends))
+            return intrinsic_value + terminal_value * discount_factors[len(dividends)]
 
         intrinsic_value = 0
 
         for i, dividend in enumerate(dividends):
-            intrinsic_value += dividend / ((1 + nominal_rate) ** (i + 1))
+            intrinsic_value += dividend / self._growth_factor(nominal_rate, 1, i + 1)
         
-        intrinsic_value += terminal_value / ((1 + nominal_rate) ** len(dividends))
+        intrinsic_value += terminal_value / self._growth_factor(nominal_rate, 1, len(dividends))
         
         return intrinsic_value
 
@@ -334,7 +537,9 @@ class FinanceCalculations:
         float: The intrinsic value of the stock
         """
         if dividend < 0 or nominal_rate <= 0:
-            return "Invalid Input: Both dividend and required rate of return must be non-negative and nominal rate should be greater than 0"
+            return self._invalid("Invalid Input: Both dividend and required rate of return must be non-negative and nominal rate should be greater than 0", first_error(
+                (dividend < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= 0, ErrorCode.INVALID_RATE)))
         
         return dividend / nominal_rate
 
@@ -353,7 +558,10 @@ class FinanceCalculations:
         float: The intrinsic value of the stock
         """
         if dividend < 0 or nominal_rate <= growth or time <= 0:
-            return "Invalid Input: Dividend and time must be non-negative, and required rate of return should be greater than growth rate"
+            return self._invalid("Invalid Input: Dividend and time must be non-negative, and required rate of return should be greater than growth rate", first_error(
+                (dividend < 0, ErrorCode.INVALID_AMOUNT),
+                (nominal_rate <= growth, ErrorCode.RATE_NOT_ABOVE_GROWTH),
+                (time <= 0, ErrorCode.INVALID_TIME)))
         
         return (dividend * (1 + growth)**time) / (nominal_rate - growth)
 
@@ -371,7 +579,10 @@ class FinanceCalculations:
         float: The holding period return (as a decimal)
         """
         if initial_price <= 0 or final_price < 0 or dividend < 0:
-            return "Invalid Input: Initial price must be positive, and final price and dividend must be non-negative"
+            return self._invalid("Invalid Input: Initial price must be positive, and final price and dividend must be non-negative", first_error(
+                (initial_price <= 0, ErrorCode.INVALID_AMOUNT),
+                (final_price < 0, ErrorCode.INVALID_AMOUNT),
+                (dividend < 0, ErrorCode.INVALID_AMOUNT)))
         
         return (final_price - initial_price + dividend*times_recieved_div) / initial_price
 
@@ -579,8 +790,11 @@ class FinanceImplementations:
         result = self.finance_calculations.holding_period_return(initial_price, final_price, dividend, times_received_div)
         print(f"Holding Period Return: {result}")
 
-if __name__ == "__main__":
-    finance_calculations = FinanceCalculations()
+def run_demos(finance_calculations=None):
+    """
+    Run every main_* demo with its hardcoded example values and print the results.
+    """
+    finance_calculations = finance_calculations if finance_calculations is not None else FinanceCalculations()
     finance_implementations = FinanceImplementations(finance_calculations)
     
     finance_implementations.main_present_value_single_cashflow()
@@ -601,3 +815,7 @@ if __name__ == "__main__":
     finance_implementations.main_ddm_no_growth()
     finance_implementations.main_ddm_constant_growth()
     finance_implementations.main_holding_period_return()
+
+
+if __name__ == "__main__":
+    run_demos()
@@ -0,0 +1,255 @@
+import os
+
+import numpy as np
+
+from .calculations import _is_curve
+
+#NPV/XNPV of dated cash flows and memory-mapped cash flow ledgers
+
+DAY_COUNTS = ("act/365", "30/360")
+
+
+def _as_days(dates):
+    return np.asarray(dates, dtype="datetime64[D]")
+
+
+def year_fraction(start, end, day_count="act/365"):
+    """
+    Year fractions between dates under a day count convention.
+
+    Parameters:
+    - start (array_like): Start dates (datetime64, datetime.date or ISO strings)
+    - end (array_like): End dates; negative fractions are returned where end is before start
+    - day_count (str): "act/365" (actual days / 365) or "30/360" (ISDA bond basis: day 31 becomes 30,
+      and an end day of 31 becomes 30 only when the start day is 30 or 31). Default is "act/365".
+
+    Returns:
+    ndarray: The year fractions (a float for scalar inputs)
+    """
+    scalar = np.ndim(start) == 0 and np.ndim(end) == 0
+    start, end = _as_days(start), _as_days(end)
+    if day_count == "act/365":
+        fractions = (end - start).astype(np.float64) / 365
+    elif day_count == "30/360":
+        fractions = _thirty_360(start, end)
+    else:
+        raise ValueError(f"day_count must be one of {DAY_COUNTS}")
+    return float(fractions) if scalar else fractions
+
+
+def _thirty_360(start, end):
+    def split(dates):
+        months = dates.astype("datetime64[M]")
+        years = months.astype("datetime64[Y]")
+        return (years.astype(np.int64), (months - years).astype(np.int64), (dates - months).astype(np.int64) + 1)
+
+    y1, m1, d1 = split(start)
+    y2, m2, d2 = split(end)
+    d1 = np.minimum(d1, 30)
+    d2 = np.where((d2 == 31) & (d1 == 30), 30, d2)
+    return (360 * (y2 - y1) + 30 * (m2 - m1) + (d2 - d1)) / 360
+
+
+def segment_sums(instrument_ids, values):
+    """
+    Sum values per run of equal, contiguous instrument ids with one np.add.reduceat.
+
+    Parameters:
+    - instrument_ids (ndarray): Ids grouped so that each instrument's rows are contiguous
+    - values (ndarray): Values to sum, same length
+
+    Returns:
+    tuple: (ids, sums), one entry per segment in input order
+    """
+    if instrument_ids.size == 0:
+        return instrument_ids[:0], np.zeros(0)
+    starts = np.concatenate(([0], np.flatnonzero(instrument_ids[1:] != instrument_ids[:-1]) + 1))
+    return instrument_ids[starts], np.add.reduceat(values, starts)
+
+
+class CashFlowLedger:
+    """
+    Cash flow ledger stored as one .npy file per column in a directory:
+
+    - instrument_id.npy: int64 instrument ids, sorted so each instrument's flows are contiguous
+    - date.npy: datetime64[D] payment dates
+    - amount.npy: float64 amounts (receipts positive, payments negative)
+
+    The columns are opened with np.load(mmap_mode="r"), so a ledger of billions of flows is paged
+    in from disk as it is read rather than loaded into RAM. Any tool that writes .npy files (or
+    np.lib.format.open_memmap) can produce one.
+    """
+    COLUMNS = (("instrument_id", np.int64), ("date", "datetime64[D]"), ("amount", np.float64))
+
+    def __init__(self, directory, mode="r"):
+        """
+        Parameters:
+        - directory (str): Directory holding the column files
+        - mode (str): Memory map mode, "r" (read-only) or "r+" (read-write). Default is "r".
+        """
+        self.directory = directory
+        for name, _ in self.COLUMNS:
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode=mode))
+        if not (self.instrument_id.shape == self.date.shape == self.amount.shape) or self.amount.ndim != 1:
+            raise ValueError("Ledger columns must be 1-D and of the same length")
+
+    @classmethod
+    def allocate(cls, directory, size):
+        """
+        Create an empty ledger of size rows on disk for a producer to fill chunk by chunk.
+
+        Returns:
+        CashFlowLedger: The ledger opened read-write
+        """
+        os.makedirs(directory, exist_ok=True)
+        for name, dtype in cls.COLUMNS:
+            column = np.lib.format.open_memmap(os.path.join(directory, f"{name}.npy"), mode="w+", dtype=dtype, shape=(size,))
+            del column
+        return cls(directory, mode="r+")
+
+    @classmethod
+    def create(cls, directory, instrument_id, date, amount):
+        """
+        Write a ledger from in-memory arrays, sorting the rows by instrument id and date.
+
+        Returns:
+        CashFlowLedger: The ledger opened read-only
+        """
+        instrument_id = np.asarray(instrument_id, dtype=np.int64)
+        date, amount = _as_days(date), np.asarray(amount, dtype=np.float64)
+        order = np.lexsort((date, instrument_id))
+        ledger = cls.allocate(directory, instrument_id.size)
+        ledger.instrument_id[:] = instrument_id[order]
+        ledger.date[:] = date[order]
+        ledger.amount[:] = amount[order]
+        ledger.flush()
+        return cls(directory)
+
+    def flush(self):
+        for name, _ in self.COLUMNS:
+            column = getattr(self, name)
+            if isinstance(column, np.memmap):
+                column.flush()
+
+    def __len__(self):
+        return self.amount.shape[0]
+
+
+class CashFlowEngine:
+    """
+    Net present value of dated cash flows, aggregated per instrument.
+
+    Each flow is discounted by (1 + r / m) ** (-m * t), where t is the year fraction from the
+    valuation date under the day count, or by a YieldCurve's discount factor at t. Flows dated
+    before the valuation date have negative t and are compounded forward, as in Excel's XNPV.
+    Ledgers are valued in chunks of chunk_size rows, and per-instrument totals come from a
+    segmented reduction (np.add.reduceat) over each chunk with instruments that straddle a
+    chunk boundary merged, so memory use is bounded by chunk_size however long the ledger is.
+    """
+    def __init__(self, day_count="act/365", compounding_frequency=1, chunk_size=10_000_000):
+        """
+        Parameters:
+        - day_count (str): "act/365" or "30/360". Default is "act/365".
+        - compounding_frequency (int): Compounding periods per year of flat rates. Default is 1 (annually, as XNPV).
+        - chunk_size (int): Ledger rows read and discounted at a time. Default is 10,000,000.
+        """
+        if day_count not in DAY_COUNTS:
+            raise ValueError(f"day_count must be one of {DAY_COUNTS}")
+        if compounding_frequency <= 0:
+            raise ValueError("compounding_frequency should be greater than 0")
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        self.day_count = day_count
+        self.compounding_frequency = compounding_frequency
+        self.chunk_size = chunk_size
+
+    def discount_factors(self, nominal_rate, times):
+        """
+        Discount factors for year fractions under a flat annual rate or a YieldCurve.
+        """
+        if _is_curve(nominal_rate):
+            return nominal_rate.discount_factor(times)
+        if nominal_rate <= -self.compounding_frequency:
+            raise ValueError("nominal_rate must be greater than -compounding_frequency")
+        m = self.compounding_frequency
+        return (1 + nominal_rate / m) ** (-m * times)
+
+    def npv(self, nominal_rate, amounts, times, instrument_ids=None):
+        """
+        Net present value of cash flows at arbitrary times in years.
+
+        Parameters:
+        - nominal_rate (float or YieldCurve): The annual discount rate (as a decimal), or a curve
+        - amounts (array_like): The cash flow amounts
+        - times (array_like): The times of the flows in years from today
+        - instrument_ids (array_like): Optional id per flow, grouped contiguously; values are then aggregated per instrument
+
+        Returns:
+        float, or tuple: The NPV, or (ids, npvs) when instrument_ids is given
+        """
+        amounts = np.asarray(amounts, dtype=np.float64)
+        present = amounts * self.discount_factors(nominal_rate, np.asarray(times, dtype=np.float64))
+        if instrument_ids is None:
+            return float(np.sum(present))
+        return segment_sums(np.asarray(instrument_ids), present)
+
+    def xnpv(self, nominal_rate, dates, amounts, valuation_date=None, instrument_ids=None):
+        """
+        Net present value of cash flows on irregular dates.
+
+        Parameters:
+        - nominal_rate (float or YieldCurve): The annual discount rate (as a decimal), or a curve
+        - dates (array_like): Payment dates (datetime64, datetime.date or ISO strings)
+        - amounts (array_like): The cash flow amounts
+        - valuation_date (date): Date values are reported at. Default is the earliest payment date (as XNPV).
+        - instrument_ids (array_like): Optional id per flow, grouped contiguously; values are then aggregated per instrument
+
+        Returns:
+        float, or tuple: The XNPV, or (ids, xnpvs) when instrument_ids is given
+        """
+        dates = _as_days(dates)
+        valuation_date = dates.min() if valuation_date is None else _as_days(valuation_date)
+        times = year_fraction(valuation_date, dates, self.day_count)
+        return self.npv(nominal_rate, amounts, times, instrument_ids)
+
+    def value_ledger(self, ledger, nominal_rate, valuation_date):
+        """
+        Value every instrument in a ledger, streaming it chunk by chunk.
+
+        Parameters:
+        - ledger (CashFlowLedger or str): The ledger, or its directory
+        - nominal_rate (float or YieldCurve): The annual discount rate (as a decimal), or a curve
+        - valuation_date (date): Date values are reported at
+
+        Returns:
+        tuple: (ids, npvs) arrays with one entry per instrument, in ledger order
+        """
+        if not isinstance(ledger, CashFlowLedger):
+            ledger = CashFlowLedger(ledger)
+        valuation_date = _as_days(valuation_date)
+
+        ids, totals = [], []
+        # The last instrument of a chunk may continue into the next one, so it is held back until its id changes
+        current_id, current_total = None, 0.0
+        for start in range(0, len(ledger), self.chunk_size):
+            stop = start + self.chunk_size
+            chunk_ids = np.asarray(ledger.instrument_id[start:stop])
+            if np.any(chunk_ids[1:] < chunk_ids[:-1]) or (current_id is not None and chunk_ids[0] < current_id):
+                raise ValueError("Ledger instrument ids must be sorted; write it with CashFlowLedger.create")
+
+            times = year_fraction(valuation_date, ledger.date[start:stop], self.day_count)
+            segment_ids, sums = segment_sums(chunk_ids, ledger.amount[start:stop] * self.discount_factors(nominal_rate, times))
+            if current_id is not None and segment_ids[0] == current_id:
+                sums[0] += current_total
+            elif current_id is not None:
+                ids.append(np.array([current_id], dtype=np.int64))
+                totals.append(np.array([current_total]))
+            ids.append(segment_ids[:-1])
+            totals.append(sums[:-1])
+            current_id, current_total = segment_ids[-1], sums[-1]
+
+        if current_id is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        ids.append(np.array([current_id], dtype=np.int64))
+        totals.append(np.array([current_total]))
+        return np.concatenate(ids), np.concatenate(totals)
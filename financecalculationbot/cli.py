@@ -0,0 +1,128 @@
+import argparse
+import sys
+
+from .calculations import FinanceCalculations, calculation_names, run_demos
+from .validation import InvalidInputError
+
+#Command line entry point
+
+def _parse_value(text):
+    # "10" -> 10, "0.05" -> 0.05, "1.2,1.3,1.4" -> [1.2, 1.3, 1.4] (dividend schedules)
+    if "," in text:
+        return [_parse_value(item) for item in text.split(",") if item]
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+
+def _parse_arguments(values):
+    args, kwargs = [], {}
+    for value in values:
+        name, separator, text = value.partition("=")
+        if separator:
+            kwargs[name] = _parse_value(text)
+        elif kwargs:
+            raise ValueError(f"positional argument {value!r} follows a name=value argument")
+        else:
+            args.append(_parse_value(value))
+    return args, kwargs
+
+
+def _run(args):
+    if args.calculation not in calculation_names():
+        raise SystemExit(f"error: unknown calculation {args.calculation!r} (see 'list')")
+    try:
+        positional, keywords = _parse_arguments(args.arguments)
+    except ValueError as error:
+        raise SystemExit(f"error: {error}")
+
+    calculations = FinanceCalculations(raise_on_invalid=True)
+    if args.exact:
+        calculations.enable_exact_mode(quantum=args.exact)
+    try:
+        result = getattr(calculations, args.calculation)(*positional, **keywords)
+    except InvalidInputError as error:
+        print(f"{error.message} [{error.code.name}]", file=sys.stderr)
+        return 1
+    except TypeError as error:
+        raise SystemExit(f"error: {error}")
+    print(result)
+    return 0
+
+
+def _batch(args):
+    # NumPy (and pyarrow for Parquet files) are only imported in this mode
+    from .pipeline import ValuationPipeline
+
+    result_cache = None
+    if args.cache:
+        from .result_cache import PersistentResultCache
+        result_cache = PersistentResultCache(args.cache)
+
+    pipeline = ValuationPipeline(chunk_size=args.chunk_size, default_calculation=args.calculation, result_cache=result_cache)
+    summary = pipeline.run(args.input, args.output)
+    print(f"{summary['rows']} rows valued, {summary['invalid']} invalid")
+    return 1 if args.fail_on_invalid and summary["invalid"] else 0
+
+
+def _list(args):
+    import inspect
+
+    for name in calculation_names():
+        parameters = list(inspect.signature(getattr(FinanceCalculations, name)).parameters.values())[1:]
+        print(f"{name}({', '.join(str(parameter) for parameter in parameters)})")
+    return 0
+
+
+def _demo(args):
+    run_demos()
+    return 0
+
+
+def _serve(args):
+    from .service import main as serve
+
+    serve(args.options)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="financecalc", description="Run finance calculations from the command line.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run a single calculation", description="Run a single calculation and print the result.")
+    run.add_argument("calculation", help="FinanceCalculations method, e.g. present_value_annuity (see 'list')")
+    run.add_argument("arguments", nargs="*", help="Arguments in order, or as name=value; lists are comma-separated, e.g. dividends=1.2,1.3,1.4")
+    run.add_argument("--exact", nargs="?", const="0.01", metavar="QUANTUM", help="Compute in Decimal and round to QUANTUM (default 0.01) where supported")
+    run.set_defaults(handler=_run)
+
+    batch = commands.add_parser("batch", help="Value a CSV or Parquet file of instruments", description="Value every row of an instrument file in chunks and write the results.")
+    batch.add_argument("input", help="Input .csv or .parquet file")
+    batch.add_argument("output", help="Output .csv or .parquet file")
+    batch.add_argument("--calculation", help="Calculation for rows without a 'calculation' column")
+    batch.add_argument("--chunk-size", type=int, default=100_000, help="Rows valued at a time. Default: %(default)s")
+    batch.add_argument("--cache", metavar="DIRECTORY", help="Persistent result cache; rows valued in earlier runs are read back instead of recomputed. The closed-form batch calculations recompute faster than a cache lookup, so this only pays off for costlier rows")
+    batch.add_argument("--fail-on-invalid", action="store_true", help="Exit with status 1 if any row is invalid")
+    batch.set_defaults(handler=_batch)
+
+    commands.add_parser("list", help="List the available calculations").set_defaults(handler=_list)
+    commands.add_parser("demo", help="Run every calculation with example values").set_defaults(handler=_demo)
+
+    # Options after "serve" (including --help) are left for the service's own parser
+    commands.add_parser("serve", help="Serve the batch calculations over HTTP", add_help=False).set_defaults(handler=_serve)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args, options = parser.parse_known_args(argv)
+    if args.command == "serve":
+        args.options = options
+    elif options:
+        parser.error(f"unrecognized arguments: {' '.join(options)}")
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+import threading
+from collections import OrderedDict
+
+#Bounded LRU cache of compounding factors
+
+class DiscountFactorCache:
+    """
+    Thread-safe LRU cache of compound growth factors (1 + nominal_rate / compounding_frequency) ** periods.
+
+    Discount factors are the reciprocals of these, so one entry serves both present and future value
+    calculations. Entries are keyed by (nominal_rate, compounding_frequency, periods).
+    """
+    def __init__(self, maxsize=4096):
+        """
+        Parameters:
+        - maxsize (int): Maximum number of factors kept before the least recently used is evicted
+        """
+        if maxsize <= 0:
+            raise ValueError("maxsize must be greater than 0")
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._factors = OrderedDict()
+        self._lock = threading.Lock()
+
+    def growth_factor(self, nominal_rate, compounding_frequency, periods):
+        """
+        Return (1 + nominal_rate / compounding_frequency) ** periods, computing it only on a miss.
+
+        Parameters:
+        - nominal_rate (float): The annual interest rate (as a decimal)
+        - compounding_frequency (int): Number of compounding periods per year
+        - periods (float): Number of compounding periods
+
+        Returns:
+        float: The compound growth factor
+        """
+        key = (nominal_rate, compounding_frequency, periods)
+        with self._lock:
+            factor = self._factors.get(key)
+            if factor is not None:
+                self._factors.move_to_end(key)
+                self.hits += 1
+                return factor
+            self.misses += 1
+
+        factor = (1 + nominal_rate / compounding_frequency) ** periods
+
+        with self._lock:
+            self._factors[key] = factor
+            self._factors.move_to_end(key)
+            if len(self._factors) > self.maxsize:
+                self._factors.popitem(last=False)
+        return factor
+
+    def stats(self):
+        """
+        Returns:
+        dict: hits, misses, currsize and maxsize
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "currsize": len(self._factors), "maxsize": self.maxsize}
+
+    def clear(self):
+        with self._lock:
+            self._factors.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._factors)
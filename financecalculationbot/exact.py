@@ -0,0 +1,113 @@
+import decimal
+import functools
+import numbers
+from decimal import Decimal
+
+#Exact Decimal arithmetic for accounting-grade results
+
+# Decimal constants per context signature, so 1, common frequencies and the quantum are built once
+_CONSTANTS = {}
+
+
+def _signature(context):
+    return (context.prec, context.rounding, context.Emin, context.Emax, context.capitals, context.clamp)
+
+
+class ExactArithmetic:
+    """
+    decimal.Decimal versions of the cent-sensitive calculations, used by FinanceCalculations in exact mode.
+
+    Every operation goes through one configurable decimal.Context, and results are quantized
+    (by default to cents with banker's rounding). Floats are converted through their shortest
+    repr, so 0.07 becomes Decimal("0.07") rather than its binary expansion. Whole-number
+    compounding periods are raised by exponentiation by squaring (about 2 log2(n) multiplications)
+    instead of Decimal's general ln/exp power, which keeps exact mode within a small constant
+    factor of float speed.
+    """
+    def __init__(self, context=None, quantum="0.01", rounding=decimal.ROUND_HALF_EVEN, power_cache_size=4096):
+        """
+        Parameters:
+        - context (decimal.Context): Precision and rounding for intermediate steps. Default is 34 significant digits, ROUND_HALF_EVEN.
+        - quantum (str or Decimal): Results are rounded to this exponent, e.g. "0.01" for cents. None keeps full precision. Default is "0.01".
+        - rounding (str): decimal rounding mode for the final quantize. Default is ROUND_HALF_EVEN.
+        - power_cache_size (int): Compounding factors (1 + r/m) ** n remembered for repeated rates and terms; 0 disables. Default is 4096.
+        """
+        self.context = context.copy() if context is not None else decimal.Context(prec=34, rounding=decimal.ROUND_HALF_EVEN)
+        self.context.traps[decimal.Inexact] = False
+        self.context.traps[decimal.Rounded] = False
+        self.rounding = rounding
+        self._constants = _CONSTANTS.setdefault(_signature(self.context), {})
+        self._one = self.constant(1)
+        self.quantum = None if quantum is None else self.constant(quantum)
+        if power_cache_size:
+            self.power = functools.lru_cache(maxsize=power_cache_size)(self.power)
+
+    def constant(self, value):
+        """
+        Returns:
+        Decimal: value created under this context, cached per context signature
+        """
+        key = (type(value), value)
+        constant = self._constants.get(key)
+        if constant is None:
+            constant = self._constants[key] = self.context.create_decimal(value)
+        return constant
+
+    def to_decimal(self, value):
+        """
+        Convert an input to Decimal: Decimals pass through, integers are exact, floats go through
+        their shortest repr. NumPy scalars are converted like the Python numbers they hold.
+        """
+        if isinstance(value, Decimal):
+            return value
+        if isinstance(value, numbers.Integral):
+            return self.constant(int(value))
+        if isinstance(value, numbers.Real):
+            return self.context.create_decimal(str(float(value)))
+        return self.context.create_decimal(value)
+
+    def power(self, base, exponent):
+        """
+        base ** exponent under the context; integral exponents use exponentiation by squaring.
+        Results are cached per instance (and so per context) unless power_cache_size is 0.
+        """
+        context = self.context
+        if exponent != exponent.to_integral_value():
+            return context.power(base, exponent)
+
+        n = int(exponent)
+        result, square = self._one, base
+        for bit in bin(abs(n))[:1:-1]:
+            if bit == "1":
+                result = context.multiply(result, square)
+            square = context.multiply(square, square)
+        return context.divide(self._one, result) if n < 0 else result
+
+    def _periodic(self, nominal_rate, compounding_frequency, time):
+        # (periodic rate, 1 + periodic rate, number of periods)
+        context = self.context
+        m = self.to_decimal(compounding_frequency)
+        rate = context.divide(self.to_decimal(nominal_rate), m)
+        return rate, context.add(self._one, rate), context.multiply(self.to_decimal(time), m)
+
+    def round(self, value):
+        if self.quantum is None:
+            return value
+        return value.quantize(self.quantum, rounding=self.rounding, context=self.context)
+
+    def present_value_single_cashflow(self, future_value, nominal_rate, time, compounding_frequency=1):
+        _, growth, periods = self._periodic(nominal_rate, compounding_frequency, time)
+        return self.round(self.context.divide(self.to_decimal(future_value), self.power(growth, periods)))
+
+    def future_value_annuity(self, annual_payment, nominal_rate, time, compounding_frequency=1):
+        context = self.context
+        rate, growth, periods = self._periodic(nominal_rate, compounding_frequency, time)
+        factor = context.divide(context.subtract(self.power(growth, periods), self._one), rate)
+        return self.round(context.multiply(self.to_decimal(annual_payment), factor))
+
+    def cash_payment_annuity_pv(self, present_value, nominal_rate, time, compounding_frequency=1):
+        context = self.context
+        rate, growth, periods = self._periodic(nominal_rate, compounding_frequency, time)
+        discount = context.divide(self._one, self.power(growth, periods))
+        payment = context.divide(context.multiply(self.to_decimal(present_value), rate), context.subtract(self._one, discount))
+        return self.round(payment)
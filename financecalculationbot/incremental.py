@@ -0,0 +1,213 @@
+import inspect
+from collections import defaultdict
+
+import numpy as np
+
+from .vectorized import VectorizedFinanceCalculations
+
+#Incremental revaluation of a book of instruments
+
+class Factor:
+    """
+    Reference to a named market input (a rate, growth or dividend forecast) shared by many instruments.
+
+    Pass Factor("usd_rate") as an instrument argument instead of a number; when the factor
+    changes, only the instruments that reference it are revalued.
+    """
+    __slots__ = ("name",)
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"Factor({self.name!r})"
+
+
+class IncrementalValuation:
+    """
+    Keeps cached results for a book of instruments and recomputes only those whose inputs changed.
+
+    Each instrument records which factors it depends on. Changing a factor or an instrument's
+    own arguments marks just the affected instruments dirty, and refresh() revalues the dirty
+    set grouped by calculation with one vectorized call per group, so an update costs time
+    proportional to the number of affected instruments rather than the size of the book.
+    """
+    def __init__(self, batch=None):
+        """
+        Parameters:
+        - batch (VectorizedFinanceCalculations): Calculator used for revaluation. Default is a new instance.
+        """
+        self.batch = batch if batch is not None else VectorizedFinanceCalculations()
+        self.factors = {}
+        self.recomputed = 0
+        self._instruments = {}
+        self._dependents = defaultdict(set)
+        self._results = {}
+        self._error_codes = {}
+        self._dirty = set()
+        self._parameters = {}
+
+    def __len__(self):
+        return len(self._instruments)
+
+    def _signature(self, calculation):
+        parameters = self._parameters.get(calculation)
+        if parameters is None:
+            method = getattr(self.batch, calculation, None)
+            if calculation.startswith("_") or not callable(method):
+                raise ValueError(f"Unknown calculation: {calculation}")
+            parameters = [
+                parameter for name, parameter in inspect.signature(method).parameters.items()
+                if name not in ("return_errors", "lengths")
+            ]
+            self._parameters[calculation] = parameters
+        return parameters
+
+    # Book maintenance
+    def add(self, instrument_id, calculation, **arguments):
+        """
+        Add (or replace) an instrument.
+
+        Parameters:
+        - instrument_id (hashable): Key of the instrument in the book
+        - calculation (str): VectorizedFinanceCalculations method that values it, e.g. "present_value_annuity"
+        - arguments: The method's arguments; any of them may be a Factor
+        """
+        names = {parameter.name for parameter in self._signature(calculation)}
+        unknown = set(arguments) - names
+        if unknown:
+            raise ValueError(f"{calculation} has no argument(s) {', '.join(sorted(unknown))}")
+        if instrument_id in self._instruments:
+            self.remove(instrument_id)
+
+        self._instruments[instrument_id] = (calculation, dict(arguments))
+        for value in arguments.values():
+            if isinstance(value, Factor):
+                self._dependents[value.name].add(instrument_id)
+        self._dirty.add(instrument_id)
+
+    def remove(self, instrument_id):
+        _, arguments = self._instruments.pop(instrument_id)
+        for value in arguments.values():
+            if isinstance(value, Factor):
+                self._dependents[value.name].discard(instrument_id)
+        self._results.pop(instrument_id, None)
+        self._error_codes.pop(instrument_id, None)
+        self._dirty.discard(instrument_id)
+
+    def update_instrument(self, instrument_id, **arguments):
+        """
+        Change some of an instrument's arguments and mark only that instrument dirty.
+        """
+        calculation, current = self._instruments[instrument_id]
+        current = dict(current)
+        current.update(arguments)
+        self.add(instrument_id, calculation, **current)
+
+    def set_factors(self, factors):
+        """
+        Set factor values and mark the instruments that depend on a changed factor dirty.
+
+        Parameters:
+        - factors (dict): Factor name to value; values equal to the current one do not trigger revaluation
+
+        Returns:
+        set: The instrument ids marked dirty
+        """
+        affected = set()
+        for name, value in factors.items():
+            if name in self.factors and _same(self.factors[name], value):
+                continue
+            self.factors[name] = value
+            affected |= self._dependents.get(name, set())
+        self._dirty |= affected
+        return affected
+
+    def set_factor(self, name, value):
+        return self.set_factors({name: value})
+
+    # Revaluation
+    def _resolve(self, value):
+        if isinstance(value, Factor):
+            try:
+                return self.factors[value.name]
+            except KeyError:
+                raise KeyError(f"Factor {value.name!r} has no value") from None
+        return value
+
+    def _revalue(self, calculation, instrument_ids):
+        columns = []
+        kwargs = {}
+        for parameter in self._signature(calculation):
+            values = []
+            for instrument_id in instrument_ids:
+                arguments = self._instruments[instrument_id][1]
+                if parameter.name in arguments:
+                    values.append(self._resolve(arguments[parameter.name]))
+                elif parameter.default is not inspect.Parameter.empty:
+                    values.append(parameter.default)
+                else:
+                    raise ValueError(f"Instrument {instrument_id!r} is missing {parameter.name!r}")
+
+            if parameter.name == "dividends":
+                lengths = np.array([len(row) for row in values], dtype=np.intp)
+                matrix = np.zeros((len(values), int(lengths.max(initial=0))))
+                for i, row in enumerate(values):
+                    matrix[i, :len(row)] = row
+                columns.append(matrix)
+                kwargs["lengths"] = lengths
+            else:
+                columns.append(np.asarray(values, dtype=np.float64))
+
+        results, codes = getattr(self.batch, calculation)(*columns, return_errors=True, **kwargs)
+        for instrument_id, result, code in zip(instrument_ids, results.tolist(), codes.tolist()):
+            self._results[instrument_id] = result
+            self._error_codes[instrument_id] = code
+
+    def refresh(self):
+        """
+        Revalue every dirty instrument.
+
+        Returns:
+        int: Number of instruments revalued
+        """
+        if not self._dirty:
+            return 0
+        groups = defaultdict(list)
+        for instrument_id in self._dirty:
+            groups[self._instruments[instrument_id][0]].append(instrument_id)
+        for calculation, instrument_ids in groups.items():
+            self._revalue(calculation, instrument_ids)
+
+        count = len(self._dirty)
+        self.recomputed += count
+        self._dirty = set()
+        return count
+
+    def value(self, instrument_id):
+        """
+        Returns:
+        float: The instrument's current value (NaN if its inputs are invalid)
+        """
+        if instrument_id in self._dirty:
+            self.refresh()
+        return self._results[instrument_id]
+
+    def error_code(self, instrument_id):
+        if instrument_id in self._dirty:
+            self.refresh()
+        return self._error_codes[instrument_id]
+
+    def values(self):
+        """
+        Returns:
+        dict: Instrument id to current value for the whole book
+        """
+        self.refresh()
+        return dict(self._results)
+
+
+def _same(old, new):
+    if isinstance(old, (list, tuple, np.ndarray)) or isinstance(new, (list, tuple, np.ndarray)):
+        return np.array_equal(np.asarray(old), np.asarray(new))
+    return old == new
@@ -0,0 +1,211 @@
+import cProfile
+import functools
+import inspect
+import io
+import pstats
+import time
+import tracemalloc
+from collections import deque
+
+from .calculations import NOT_CALCULATIONS
+from .validation import InvalidInputError
+
+#Opt-in instrumentation for FinanceCalculations
+
+class MethodStats:
+    """
+    Call count, cumulative latency, recent latency samples and invalid-input count for one method.
+    """
+    __slots__ = ("calls", "total_seconds", "invalid", "samples")
+
+    def __init__(self, sample_size):
+        self.calls = 0
+        self.total_seconds = 0.0
+        self.invalid = 0
+        self.samples = deque(maxlen=sample_size)
+
+    def quantile(self, q):
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "total_seconds": self.total_seconds,
+            "p50_seconds": self.quantile(0.50),
+            "p99_seconds": self.quantile(0.99),
+            "invalid": self.invalid,
+        }
+
+
+class ProfileCapture:
+    """
+    Results of Instrumentation.profile: a cProfile.Profile and, when memory tracing was on,
+    the peak traced memory and a tracemalloc snapshot.
+    """
+    def __init__(self):
+        self.profile = None
+        self.peak_memory_bytes = None
+        self.snapshot = None
+
+    def stats_text(self, sort="cumulative", limit=20):
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def top_allocations(self, limit=10):
+        if self.snapshot is None:
+            return []
+        return self.snapshot.statistics("lineno")[:limit]
+
+
+class Instrumentation:
+    """
+    Records per-method statistics for one FinanceCalculations instance.
+
+    Methods are wrapped only while instrumentation is enabled (inside the with block, or
+    between enable() and disable()), by shadowing them with instance attributes. Once
+    disabled the wrappers are removed, so an uninstrumented calculator runs the original
+    methods with no added overhead.
+    """
+    def __init__(self, calculations, sample_size=10_000):
+        """
+        Parameters:
+        - calculations (FinanceCalculations): The calculator to instrument
+        - sample_size (int): Number of recent latencies kept per method for p50/p99. Default is 10,000.
+        """
+        self.calculations = calculations
+        self.sample_size = sample_size
+        self.stats = {}
+        self._wrapped = []
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.disable()
+
+    def _method_names(self):
+        return [
+            name for name, member in inspect.getmembers(type(self.calculations), inspect.isfunction)
+            if not name.startswith("_") and name not in NOT_CALCULATIONS
+        ]
+
+    def _wrap(self, name, method):
+        stats = self.stats.setdefault(name, MethodStats(self.sample_size))
+        perf_counter = time.perf_counter
+
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                result = method(*args, **kwargs)
+            except InvalidInputError:
+                stats.invalid += 1
+                raise
+            finally:
+                elapsed = perf_counter() - start
+                stats.calls += 1
+                stats.total_seconds += elapsed
+                stats.samples.append(elapsed)
+            if isinstance(result, str):
+                stats.invalid += 1
+            return result
+
+        return wrapper
+
+    def enable(self):
+        if self._wrapped:
+            return
+        for name in self._method_names():
+            setattr(self.calculations, name, self._wrap(name, getattr(self.calculations, name)))
+            self._wrapped.append(name)
+
+    def disable(self):
+        for name in self._wrapped:
+            delattr(self.calculations, name)
+        self._wrapped = []
+
+    def reset(self):
+        self.stats.clear()
+        if self._wrapped:
+            self.disable()
+            self.enable()
+
+    def as_dict(self):
+        """
+        Returns:
+        dict: Method name to calls, total_seconds, p50_seconds, p99_seconds and invalid
+        """
+        return {name: stats.as_dict() for name, stats in sorted(self.stats.items())}
+
+    def to_prometheus(self, prefix="finance_calculations"):
+        """
+        Returns:
+        str: The statistics in the Prometheus text exposition format
+        """
+        methods = sorted(self.stats.items())
+        labels = {name: f'method="{name}"' for name, _ in methods}
+        # Each metric family's HELP and TYPE lines come directly before all of its samples
+        lines = [
+            f"# HELP {prefix}_calls_total Calls per FinanceCalculations method.",
+            f"# TYPE {prefix}_calls_total counter",
+        ]
+        lines.extend(f"{prefix}_calls_total{{{labels[name]}}} {stats.calls}" for name, stats in methods)
+        lines.extend([
+            f"# HELP {prefix}_invalid_total Calls that returned or raised an invalid input error.",
+            f"# TYPE {prefix}_invalid_total counter",
+        ])
+        lines.extend(f"{prefix}_invalid_total{{{labels[name]}}} {stats.invalid}" for name, stats in methods)
+        lines.extend([
+            f"# HELP {prefix}_latency_seconds Wall-clock time per call.",
+            f"# TYPE {prefix}_latency_seconds summary",
+        ])
+        for name, stats in methods:
+            label = labels[name]
+            lines.append(f'{prefix}_latency_seconds{{{label},quantile="0.5"}} {stats.quantile(0.50)!r}')
+            lines.append(f'{prefix}_latency_seconds{{{label},quantile="0.99"}} {stats.quantile(0.99)!r}')
+            lines.append(f"{prefix}_latency_seconds_sum{{{label}}} {stats.total_seconds!r}")
+            lines.append(f"{prefix}_latency_seconds_count{{{label}}} {stats.calls}")
+        return "\n".join(lines) + "\n"
+
+    @staticmethod
+    def profile(memory=False):
+        """
+        Capture a cProfile profile (and optionally tracemalloc peak memory) around a block.
+
+        Usage:
+            with Instrumentation.profile(memory=True) as capture:
+                ...
+            print(capture.stats_text())
+
+        Parameters:
+        - memory (bool): Also trace allocations with tracemalloc. Default is False.
+
+        Returns:
+        contextmanager: Yields a ProfileCapture that is filled in when the block exits
+        """
+        return _ProfileBlock(memory)
+
+
+class _ProfileBlock:
+    def __init__(self, memory):
+        self.memory = memory
+        self.capture = ProfileCapture()
+
+    def __enter__(self):
+        if self.memory:
+            tracemalloc.start()
+        self.capture.profile = cProfile.Profile()
+        self.capture.profile.enable()
+        return self.capture
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.capture.profile.disable()
+        if self.memory:
+            _, self.capture.peak_memory_bytes = tracemalloc.get_traced_memory()
+            self.capture.snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
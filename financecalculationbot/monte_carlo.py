@@ -0,0 +1,226 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .vectorized import VectorizedFinanceCalculations
+
+#Monte Carlo valuation under stochastic rates and growth
+
+class StreamingSummary:
+    """
+    Running mean, variance, min/max and histogram-based quantiles of a stream of values.
+
+    Only the running moments and a fixed number of histogram bins are kept, so memory does
+    not grow with the number of paths. Quantiles are accurate to one bin width; invalid
+    (NaN) values are counted separately and excluded.
+    """
+    def __init__(self, bins=20_000, low=None, high=None):
+        """
+        Parameters:
+        - bins (int): Histogram resolution used for quantiles. Default is 20,000.
+        - low, high (float): Histogram range. Default is taken from the central 99.9% of the first chunk, widened by its width on each side; values outside are clamped into the edge bins.
+        """
+        self.bins = bins
+        self.low = low
+        self.high = high
+        self.count = 0
+        self.invalid = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.minimum = float("inf")
+        self.maximum = float("-inf")
+        self._histogram = np.zeros(bins, dtype=np.int64)
+
+    def update(self, values):
+        values = np.asarray(values, dtype=np.float64).ravel()
+        valid = values[~np.isnan(values)]
+        self.invalid += values.size - valid.size
+        if valid.size == 0:
+            return
+
+        if self.low is None or self.high is None:
+            # Size the range from the bulk of the first chunk so a few extreme paths
+            # (e.g. rate close to growth) do not flatten every quantile into one bin
+            bottom, top = np.quantile(valid, [0.0005, 0.9995])
+            spread = max(top - bottom, 1e-12 * max(abs(bottom), abs(top), 1.0))
+            self.low = float(bottom - spread) if self.low is None else self.low
+            self.high = float(top + spread) if self.high is None else self.high
+
+        # Chan et al. parallel update of mean and sum of squared deviations
+        count = valid.size
+        mean = float(valid.mean())
+        m2 = float(np.sum((valid - mean) ** 2))
+        delta = mean - self.mean
+        total = self.count + count
+        self.mean += delta * count / total
+        self._m2 += m2 + delta ** 2 * self.count * count / total
+        self.count = total
+
+        self.minimum = min(self.minimum, float(valid.min()))
+        self.maximum = max(self.maximum, float(valid.max()))
+        indices = ((valid - self.low) / (self.high - self.low) * self.bins).astype(np.int64)
+        np.clip(indices, 0, self.bins - 1, out=indices)
+        self._histogram += np.bincount(indices, minlength=self.bins)
+
+    def merge(self, other):
+        """
+        Combine another summary built with the same bins and range into this one.
+        """
+        if other.count == 0:
+            self.invalid += other.invalid
+            return self
+        if self.count == 0:
+            self.low, self.high = other.low, other.high
+        elif (self.low, self.high, self.bins) != (other.low, other.high, other.bins):
+            raise ValueError("Summaries must share bins, low and high to be merged")
+        delta = other.mean - self.mean
+        total = self.count + other.count
+        self.mean += delta * other.count / total
+        self._m2 += other._m2 + delta ** 2 * self.count * other.count / total
+        self.count = total
+        self.invalid += other.invalid
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+        self._histogram += other._histogram
+        return self
+
+    @property
+    def std(self):
+        return float(np.sqrt(self._m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    def quantile(self, q):
+        if self.count == 0:
+            return float("nan")
+        cumulative = np.cumsum(self._histogram)
+        index = int(np.searchsorted(cumulative, q * self.count, side="left"))
+        width = (self.high - self.low) / self.bins
+        return float(min(max(self.low + (index + 0.5) * width, self.minimum), self.maximum))
+
+    def value_at_risk(self, confidence=0.95):
+        """
+        Loss at the given confidence relative to the mean value, i.e. mean - quantile(1 - confidence).
+        """
+        return self.mean - self.quantile(1 - confidence)
+
+    def as_dict(self, quantiles=(0.01, 0.05, 0.5, 0.95, 0.99), confidence=0.95):
+        return {
+            "paths": self.count,
+            "invalid": self.invalid,
+            "mean": self.mean,
+            "std": self.std,
+            "min": self.minimum,
+            "max": self.maximum,
+            "quantiles": {q: self.quantile(q) for q in quantiles},
+            "value_at_risk": self.value_at_risk(confidence),
+        }
+
+
+def _simulate_chunk(simulation, calculation, arguments, paths, seed, bins, low, high):
+    # Module-level so process pool workers can run a chunk
+    summary = StreamingSummary(bins, low, high)
+    rng = np.random.default_rng(seed)
+    summary.update(simulation._value(calculation, arguments, paths, rng))
+    return summary
+
+
+class MonteCarloSimulation:
+    """
+    Values instruments under simulated rate and growth paths by feeding the simulated
+    scenarios through the existing vectorized formulas.
+
+    Rates follow a Vasicek (mean-reverting Gaussian) process discretised yearly and growth
+    is normally distributed around its expectation; each path's rate is the average short
+    rate over the horizon, which is the flat rate that discounts that path. Paths are
+    generated in chunks from a seeded numpy.random.SeedSequence, so results are
+    reproducible for a given seed and chunk_size, whatever the number of workers.
+    """
+    def __init__(self, rate_volatility=0.01, mean_reversion=0.1, long_term_rate=None,
+                 growth_volatility=0.01, horizon=10, seed=None, chunk_size=1_000_000):
+        """
+        Parameters:
+        - rate_volatility (float): Annual volatility of the short rate. Default is 0.01.
+        - mean_reversion (float): Speed at which the short rate reverts to long_term_rate. Default is 0.1.
+        - long_term_rate (float): Long-run short rate. Default is None (the instrument's own rate).
+        - growth_volatility (float): Standard deviation of the growth rate. Default is 0.01.
+        - horizon (int): Years of short-rate path averaged into each path's discount rate. Default is 10.
+        - seed (int): Seed for reproducible paths. Default is None.
+        - chunk_size (int): Paths simulated and summarised at a time. Default is 1,000,000.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        self.rate_volatility = rate_volatility
+        self.mean_reversion = mean_reversion
+        self.long_term_rate = long_term_rate
+        self.growth_volatility = growth_volatility
+        self.horizon = horizon
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.batch = VectorizedFinanceCalculations()
+
+    def simulate_rates(self, initial_rate, paths, rng):
+        """
+        Simulate yearly Vasicek short-rate paths and return each path's average rate.
+
+        The path is accumulated one year at a time, so memory is O(paths), not O(paths x horizon).
+        """
+        long_term_rate = initial_rate if self.long_term_rate is None else self.long_term_rate
+        rate = np.full(paths, float(initial_rate))
+        total = np.zeros(paths)
+        for _ in range(self.horizon):
+            rate += self.mean_reversion * (long_term_rate - rate) + self.rate_volatility * rng.standard_normal(paths)
+            total += rate
+        return total / self.horizon
+
+    def simulate_growth(self, growth, paths, rng):
+        return growth + self.growth_volatility * rng.standard_normal(paths)
+
+    def _value(self, calculation, arguments, paths, rng):
+        arguments = dict(arguments)
+        arguments["nominal_rate"] = self.simulate_rates(arguments["nominal_rate"], paths, rng)
+        if "growth" in arguments:
+            arguments["growth"] = self.simulate_growth(arguments["growth"], paths, rng)
+        return getattr(self.batch, calculation)(**arguments)
+
+    def run(self, calculation, paths, workers=1, bins=20_000, **arguments):
+        """
+        Value one instrument over simulated paths and summarise the distribution.
+
+        Parameters:
+        - calculation (str): A VectorizedFinanceCalculations method taking nominal_rate (and optionally growth), e.g. "dividend_discount_model", "ddm_constant_growth" or "future_value_annuity"
+        - paths (int): Number of simulated paths
+        - workers (int): Number of processes to spread the chunks over. Default is 1 (in-process).
+        - bins (int): Histogram resolution for the streamed quantiles. Default is 20,000.
+        - arguments: The calculation's arguments; nominal_rate and growth are the expected values around which paths are simulated
+
+        Returns:
+        StreamingSummary: mean, std, quantiles and VaR of the simulated values
+        """
+        if paths <= 0:
+            raise ValueError("paths must be greater than 0")
+        if "nominal_rate" not in arguments:
+            raise ValueError("Monte Carlo calculations need a nominal_rate argument")
+
+        chunks = [min(self.chunk_size, paths - start) for start in range(0, paths, self.chunk_size)]
+        seeds = np.random.SeedSequence(self.seed).spawn(len(chunks))
+
+        # The first chunk with a valid value fixes the histogram range so every chunk's summary
+        # can be merged; chunks are valued in-process until then
+        summary = StreamingSummary(bins)
+        remaining = list(zip(chunks, seeds))
+        while remaining and summary.low is None:
+            size, seed = remaining.pop(0)
+            summary.update(self._value(calculation, arguments, size, np.random.default_rng(seed)))
+
+        if workers > 1 and remaining:
+            with ProcessPoolExecutor(max_workers=min(workers, os.cpu_count() or 1)) as pool:
+                futures = [
+                    pool.submit(_simulate_chunk, self, calculation, arguments, size, seed, bins, summary.low, summary.high)
+                    for size, seed in remaining
+                ]
+                for future in futures:
+                    summary.merge(future.result())
+        else:
+            for size, seed in remaining:
+                summary.update(self._value(calculation, arguments, size, np.random.default_rng(seed)))
+        return summary
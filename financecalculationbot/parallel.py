@@ -0,0 +1,166 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from .calculations import _is_curve
+from .vectorized import VectorizedFinanceCalculations
+
+#Multi-core execution of batch calculations
+
+def _attach(name, shape, dtype):
+    block = shared_memory.SharedMemory(name=name)
+    return block, np.ndarray(shape, dtype=dtype, buffer=block.buf)
+
+
+def _run_shard(calculation, arguments, result_name, codes_name, result_shape, start, stop):
+    # Worker side: array arguments arrive as shared memory (name, shape, dtype), everything else by value
+    blocks = []
+    try:
+        shard_arguments = []
+        for kind, value in arguments:
+            if kind == "shared":
+                block, array = _attach(*value)
+                blocks.append(block)
+                shard_arguments.append(array[start:stop])
+            else:
+                shard_arguments.append(value)
+
+        result_block, result = _attach(result_name, result_shape, np.float64)
+        codes_block, codes = _attach(codes_name, result_shape, np.uint8)
+        blocks.extend([result_block, codes_block])
+
+        values, errors = getattr(VectorizedFinanceCalculations(), calculation)(*shard_arguments, return_errors=True)
+        result[start:stop] = values
+        codes[start:stop] = errors
+        del shard_arguments, result, codes, values, errors
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _as_array(arg):
+    # Numeric array_likes become arrays; curves and other objects are passed through unchanged
+    if _is_curve(arg):
+        return None
+    try:
+        array = np.asarray(arg)
+    except (TypeError, ValueError):
+        return None
+    if array.dtype.kind in "biu":
+        return array
+    try:
+        return array.astype(np.float64, copy=False)
+    except (TypeError, ValueError):
+        return None
+
+
+class ParallelExecutor:
+    """
+    Runs any VectorizedFinanceCalculations method across a process pool.
+
+    Array arguments are copied once into shared memory and each worker values a contiguous
+    slice of it in place, so inputs are never pickled per task. Results are written back to
+    shared memory at each shard's offset, which keeps the output order identical to a
+    single-process call.
+    """
+    def __init__(self, max_workers=None, min_shard_size=50_000):
+        """
+        Parameters:
+        - max_workers (int): Number of worker processes. Default is os.cpu_count().
+        - min_shard_size (int): Inputs smaller than this per worker run in-process instead. Default is 50,000.
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.min_shard_size = min_shard_size
+        self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+        return self._pool
+
+    def run(self, calculation, *args, return_errors=False):
+        """
+        Run a batch calculation, sharding its inputs across the worker processes.
+
+        Array arguments are split along their first axis, one row per instrument, so a
+        (stocks, years) dividend matrix and a per-stock rate shard together. Each array's first
+        axis must have the instruments' length or 1 (broadcast); scalars, YieldCurves and other
+        non-array arguments are passed to every shard unchanged. Calls whose result has no
+        instrument axis (e.g. a single stock's dividend schedule) run in-process.
+
+        Parameters:
+        - calculation (str): Name of a VectorizedFinanceCalculations method, e.g. "present_value_annuity"
+        - args (array_like or YieldCurve): The method's arguments
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The results in input order, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        if calculation.startswith("_") or not callable(getattr(VectorizedFinanceCalculations, calculation, None)):
+            raise ValueError(f"Unknown calculation: {calculation}")
+        method = getattr(VectorizedFinanceCalculations(), calculation)
+
+        arrays = [_as_array(arg) for arg in args]
+        lengths = {array.shape[0] for array in arrays if array is not None and array.ndim > 0} - {1}
+        if len(lengths) > 1:
+            raise ValueError(f"Array arguments must share their first axis length (or have length 1), got {sorted(lengths)}")
+        rows = lengths.pop() if lengths else 1
+
+        # Valuing the first row checks the arguments and gives the per-row result shape
+        probe = method(*(arg if array is None or array.ndim == 0 else array[:1] for arg, array in zip(args, arrays)))
+        probe = np.asarray(probe)
+        size = rows * int(np.prod(probe.shape[1:]))
+        shards = min(self.max_workers, rows, size // self.min_shard_size)
+
+        if probe.ndim == 0 or probe.shape[0] != 1 or shards <= 1:
+            return method(*args, return_errors=return_errors)
+
+        result_shape = (rows, *probe.shape[1:])
+        blocks = []
+        try:
+            arguments = []
+            for arg, array in zip(args, arrays):
+                if array is None or array.ndim == 0:
+                    arguments.append(("value", arg if array is None else array[()]))
+                    continue
+                shape = (rows, *array.shape[1:])
+                block = shared_memory.SharedMemory(create=True, size=max(1, int(np.prod(shape)) * array.itemsize))
+                blocks.append(block)
+                np.ndarray(shape, dtype=array.dtype, buffer=block.buf)[...] = np.broadcast_to(array, shape)
+                arguments.append(("shared", (block.name, shape, array.dtype)))
+
+            result_block = shared_memory.SharedMemory(create=True, size=size * 8)
+            codes_block = shared_memory.SharedMemory(create=True, size=size)
+            blocks.extend([result_block, codes_block])
+
+            bounds = np.linspace(0, rows, shards + 1).astype(int)
+            futures = [
+                self._get_pool().submit(_run_shard, calculation, arguments, result_block.name, codes_block.name, result_shape, int(start), int(stop))
+                for start, stop in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+
+            result = np.ndarray(result_shape, dtype=np.float64, buffer=result_block.buf).copy()
+            codes = np.ndarray(result_shape, dtype=np.uint8, buffer=codes_block.buf).copy()
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        if return_errors:
+            return result, codes
+        return result
@@ -0,0 +1,192 @@
+import csv
+import inspect
+import os
+from itertools import islice
+
+import numpy as np
+
+from .validation import ErrorCode
+from .vectorized import VectorizedFinanceCalculations
+
+#Streaming valuation of instrument files
+
+class ValuationPipeline:
+    """
+    Streams instrument rows from CSV (or Parquet, when pyarrow is installed) through the
+    vectorized calculator in fixed-size chunks and writes results as each chunk completes,
+    so memory use depends on chunk_size rather than file size.
+
+    Each input row names the calculation to run in a "calculation" column (e.g.
+    "present_value_annuity", "dividend_discount_model") and supplies that method's
+    arguments in columns of the same names. Arguments with defaults, such as
+    compounding_frequency, may be omitted or left blank.
+    """
+    def __init__(self, batch=None, chunk_size=100_000, default_calculation=None, result_cache=None):
+        """
+        Parameters:
+        - batch (VectorizedFinanceCalculations): Calculator used for every chunk. Default is a new instance.
+        - chunk_size (int): Number of rows read, valued and written at a time. Default is 100,000.
+        - default_calculation (str): Calculation used for rows without a "calculation" column. Default is None.
+        - result_cache (PersistentResultCache): Serve rows valued in earlier runs from disk and compute only the rest. The closed-form batch methods recompute faster than a lookup, so this only pays off for costlier calculations. Default is None.
+        """
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        self.batch = batch if batch is not None else VectorizedFinanceCalculations()
+        self.chunk_size = chunk_size
+        self.default_calculation = default_calculation
+        self.result_cache = result_cache
+        self._signatures = {}
+
+    def _parameters(self, calculation):
+        parameters = self._signatures.get(calculation)
+        if parameters is None:
+            method = getattr(self.batch, calculation, None)
+            if calculation.startswith("_") or not callable(method):
+                raise ValueError(f"Unknown calculation: {calculation}")
+            parameters = [
+                parameter for name, parameter in inspect.signature(method).parameters.items()
+                if name != "return_errors"
+            ]
+            self._signatures[calculation] = parameters
+        return parameters
+
+    @staticmethod
+    def _column_as_float(values):
+        try:
+            return np.asarray(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            # Blank cells; only this slower path checks values one by one
+            return np.array([np.nan if value in ("", None) else float(value) for value in values], dtype=np.float64)
+
+    # Readers
+    def _read_csv_chunks(self, path):
+        with open(path, newline="") as handle:
+            reader = csv.reader(handle)
+            header = next(reader)
+            while True:
+                rows = list(islice(reader, self.chunk_size))
+                if not rows:
+                    return
+                yield {name: [row[i] for row in rows] for i, name in enumerate(header)}
+
+    def _read_parquet_chunks(self, path):
+        import pyarrow.parquet as pq
+
+        for record_batch in pq.ParquetFile(path).iter_batches(batch_size=self.chunk_size):
+            yield record_batch.to_pydict()
+
+    def read_chunks(self, path):
+        """
+        Yield the input file as column dictionaries of at most chunk_size rows.
+
+        Parameters:
+        - path (str): A .csv or .parquet file
+
+        Returns:
+        generator: dicts mapping column name to a list of values
+        """
+        if os.path.splitext(path)[1].lower() in (".parquet", ".pq"):
+            return self._read_parquet_chunks(path)
+        return self._read_csv_chunks(path)
+
+    def value_chunk(self, columns):
+        """
+        Value one chunk, dispatching each group of rows to its calculation in a single vectorized call.
+
+        Parameters:
+        - columns (dict): Column name to list of values, as produced by read_chunks
+
+        Returns:
+        dict: "calculation", "result" and "error_code" columns in input row order
+        """
+        size = len(next(iter(columns.values())))
+        if "calculation" in columns:
+            calculations = np.asarray(columns["calculation"], dtype=object)
+        elif self.default_calculation is not None:
+            calculations = np.full(size, self.default_calculation, dtype=object)
+        else:
+            raise ValueError("Input has no calculation column and no default_calculation was given")
+
+        results = np.full(size, np.nan)
+        error_codes = np.zeros(size, dtype=np.uint8)
+
+        for calculation in np.unique(calculations):
+            rows = np.flatnonzero(calculations == calculation)
+            arguments = []
+            for parameter in self._parameters(calculation):
+                if parameter.name in columns:
+                    column = columns[parameter.name]
+                    values = self._column_as_float(column if len(rows) == size else [column[i] for i in rows])
+                    if parameter.default is not inspect.Parameter.empty:
+                        values[np.isnan(values)] = parameter.default
+                    arguments.append(values)
+                elif parameter.default is not inspect.Parameter.empty:
+                    arguments.append(parameter.default)
+                else:
+                    raise ValueError(f"Input is missing column {parameter.name!r} required by {calculation}")
+            if self.result_cache is not None:
+                values, codes = self.result_cache.compute(self.batch, calculation, *arguments, return_errors=True)
+            else:
+                values, codes = getattr(self.batch, calculation)(*arguments, return_errors=True)
+            results[rows] = values
+            error_codes[rows] = codes
+
+        return {"calculation": calculations, "result": results, "error_code": error_codes}
+
+    def iter_results(self, path):
+        """
+        Yield valued chunks of the input file one at a time.
+
+        Parameters:
+        - path (str): A .csv or .parquet file
+
+        Returns:
+        generator: dicts as returned by value_chunk
+        """
+        for columns in self.read_chunks(path):
+            yield self.value_chunk(columns)
+
+    # Writers
+    def _write_csv(self, path, chunks):
+        with open(path, "w", newline="") as handle:
+            writer = csv.writer(handle)
+            writer.writerow(["row", "calculation", "result", "error_code"])
+            for start, chunk in chunks:
+                rows = range(start, start + len(chunk["result"]))
+                writer.writerows(zip(rows, chunk["calculation"], chunk["result"].tolist(), chunk["error_code"].tolist()))
+
+    def _write_parquet(self, path, chunks):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([("row", pa.int64()), ("calculation", pa.string()), ("result", pa.float64()), ("error_code", pa.uint8())])
+        with pq.ParquetWriter(path, schema) as writer:
+            for start, chunk in chunks:
+                rows = np.arange(start, start + len(chunk["result"]), dtype=np.int64)
+                writer.write_table(pa.table([rows, chunk["calculation"].tolist(), chunk["result"], chunk["error_code"]], schema=schema))
+
+    def run(self, input_path, output_path):
+        """
+        Value every row of input_path and write the results incrementally to output_path.
+
+        Parameters:
+        - input_path (str): A .csv or .parquet file of instruments
+        - output_path (str): A .csv or .parquet file for row, calculation, result and error_code
+
+        Returns:
+        dict: Number of rows processed and number of invalid rows
+        """
+        summary = {"rows": 0, "invalid": 0}
+
+        def chunks():
+            for chunk in self.iter_results(input_path):
+                start = summary["rows"]
+                summary["rows"] += len(chunk["result"])
+                summary["invalid"] += int(np.count_nonzero(chunk["error_code"] != ErrorCode.OK))
+                yield start, chunk
+
+        if os.path.splitext(output_path)[1].lower() in (".parquet", ".pq"):
+            self._write_parquet(output_path, chunks())
+        else:
+            self._write_csv(output_path, chunks())
+        return summary
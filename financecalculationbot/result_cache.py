@@ -0,0 +1,356 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from contextlib import contextmanager
+
+import numpy as np
+
+from . import __version__
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers must not run concurrently
+    fcntl = None
+
+#Persistent append-only result cache
+
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+# Times a lookup re-reads the manifest when a concurrent writer deletes a segment under it
+_LOOKUP_ATTEMPTS = 5
+
+# Fraction of max_entries kept by an eviction, so a full cache is not rewritten on every insert
+_EVICT_TO = 0.9
+
+
+def _mix(h):
+    # splitmix64 finalizer, in place on a uint64 array (wraps modulo 2**64)
+    h ^= h >> np.uint64(30)
+    h *= _MIX1
+    h ^= h >> np.uint64(27)
+    h *= _MIX2
+    h ^= h >> np.uint64(31)
+    return h
+
+
+def hash_arguments(calculation, arguments, version=__version__):
+    """
+    Stable 128-bit hashes of (calculation, argument row, library version), as two uint64 arrays.
+
+    Arguments are hashed as float64 bit patterns, so 10 and 10.0 hash alike, -0.0 equals 0.0
+    and every NaN is the same. The same inputs give the same hashes across processes and runs.
+
+    Parameters:
+    - calculation (str): Method name
+    - arguments (sequence of array_like): The method's arguments; arrays are broadcast together
+    - version (str): Library version mixed into the hash, so an upgrade invalidates old results
+
+    Returns:
+    tuple: (keys, checks), uint64 arrays of the broadcast shape, flattened
+    """
+    columns = np.broadcast_arrays(*(np.asarray(argument, dtype=np.float64) for argument in arguments))
+    size = columns[0].size if columns else 1
+    seeds = hashlib.blake2b(f"{version}\0{calculation}".encode(), digest_size=16).digest()
+    keys = np.full(size, int.from_bytes(seeds[:8], "little"), dtype=np.uint64)
+    checks = np.full(size, int.from_bytes(seeds[8:], "little"), dtype=np.uint64)
+    for column in columns:
+        column = np.ravel(column) + 0.0
+        nan = np.isnan(column)
+        if nan.any():
+            column[nan] = np.nan
+        bits = column.view(np.uint64)
+        keys ^= bits
+        _mix(keys)
+        checks += bits
+        checks *= _MIX2
+        _mix(checks)
+    return keys, checks
+
+
+class _Segment:
+    __slots__ = ("key", "check", "value", "code")
+
+    def __init__(self, directory):
+        for name in self.__slots__:
+            setattr(self, name, np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r"))
+
+    def __len__(self):
+        return self.key.shape[0]
+
+
+class PersistentResultCache:
+    """
+    On-disk cache of calculation results keyed by a hash of (method name, arguments, library version).
+
+    The store is a directory of immutable segments, each holding sorted key, check, value and
+    error code columns as .npy files, plus a manifest listing the live segments. An insert writes
+    one new segment and atomically replaces the manifest. A lookup memory-maps the segments and
+    resolves a whole batch of rows with np.searchsorted, newest segment first. Readers never take
+    a lock and always see a complete manifest; if a writer deletes a segment a reader was about to
+    open, the reader re-reads the manifest and retries. Writers serialize on a lock file. When the cache
+    holds more than max_entries, rows are evicted oldest segment first, down to 90% of max_entries:
+    whole segments while that suffices, then an arbitrary part of the oldest remaining one, so a
+    small insert into a full cache only evicts about a tenth of it. Once there are more than
+    max_segments they are merged into one.
+
+    Keys are 128-bit (a 64-bit key plus a 64-bit check), so unrelated inputs colliding is
+    negligible even across billions of entries.
+    """
+    def __init__(self, directory, max_entries=20_000_000, max_segments=16, version=__version__):
+        """
+        Parameters:
+        - directory (str): Cache directory, created if missing
+        - max_entries (int): Entries kept before the oldest segments are evicted. Default is 20,000,000.
+        - max_segments (int): Segments kept before they are merged into one. Default is 16.
+        - version (str): Version mixed into every key. Default is the library version.
+        """
+        if max_entries <= 0 or max_segments <= 0:
+            raise ValueError("max_entries and max_segments must be greater than 0")
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_segments = max_segments
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self._segments = {}
+        os.makedirs(directory, exist_ok=True)
+
+    # Manifest and segments
+    def _manifest(self):
+        try:
+            with open(os.path.join(self.directory, "manifest.json")) as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {"segments": [], "next": 0}
+
+    def _write_manifest(self, manifest):
+        handle, path = tempfile.mkstemp(dir=self.directory, suffix=".json")
+        with os.fdopen(handle, "w") as out:
+            json.dump(manifest, out)
+        os.replace(path, os.path.join(self.directory, "manifest.json"))
+
+    def _segment(self, name):
+        segment = self._segments.get(name)
+        if segment is None:
+            segment = self._segments[name] = _Segment(os.path.join(self.directory, name))
+        return segment
+
+    def _live_segments(self):
+        # (name, size) pairs, oldest first; segments dropped from the manifest are released
+        segments = self._manifest()["segments"]
+        for name in set(self._segments) - {name for name, _ in segments}:
+            del self._segments[name]
+        return segments
+
+    @contextmanager
+    def _write_lock(self):
+        with open(os.path.join(self.directory, "lock"), "a") as handle:
+            if fcntl is not None:
+                fcntl.flock(handle, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def _write_segment(self, name, key, check, value, code):
+        staging = tempfile.mkdtemp(dir=self.directory, prefix=".staging-")
+        for column, array in (("key", key), ("check", check), ("value", value), ("code", code)):
+            np.save(os.path.join(staging, f"{column}.npy"), array)
+        os.replace(staging, os.path.join(self.directory, name))
+
+    @staticmethod
+    def _newest_unique(key, check, value, code):
+        # Sort by key keeping the last occurrence of each key, so newer rows win
+        order = np.argsort(key[::-1], kind="stable")
+        key = key[::-1][order]
+        first = np.concatenate(([True], key[1:] != key[:-1])) if key.size else np.zeros(0, dtype=bool)
+        rows = order[first]
+        return key[first], check[::-1][rows], value[::-1][rows], code[::-1][rows]
+
+    # Lookup and insert
+    def _lookup_segments(self, keys, checks):
+        values = np.full(keys.shape, np.nan)
+        codes = np.zeros(keys.shape, dtype=np.uint8)
+        found = np.zeros(keys.shape, dtype=bool)
+        segments = self._live_segments()
+        # Searching in key order turns the binary searches and gathers into a forward sweep over each segment
+        pending = np.argsort(keys) if segments else np.zeros(0, dtype=np.intp)
+        for name, _ in reversed(segments):
+            if pending.size == 0:
+                break
+            segment = self._segment(name)
+            if len(segment) == 0:
+                continue
+            index = np.minimum(np.searchsorted(segment.key, keys[pending]), len(segment) - 1)
+            hit = (segment.key[index] == keys[pending]) & (segment.check[index] == checks[pending])
+            rows, index = pending[hit], index[hit]
+            values[rows] = segment.value[index]
+            codes[rows] = segment.code[index]
+            found[rows] = True
+            pending = pending[~hit]
+        return values, codes, found
+
+    def lookup_hashes(self, keys, checks):
+        """
+        Look up precomputed hashes.
+
+        Returns:
+        tuple: (values, codes, found) arrays; values are NaN and codes 0 where found is False
+        """
+        for attempt in range(_LOOKUP_ATTEMPTS):
+            try:
+                values, codes, found = self._lookup_segments(keys, checks)
+                break
+            except FileNotFoundError:
+                # A writer evicted or merged a segment between our manifest read and opening it;
+                # the current manifest no longer lists it, so the lookup is simply repeated
+                if attempt == _LOOKUP_ATTEMPTS - 1:
+                    raise
+
+        hits = int(np.count_nonzero(found))
+        self.hits += hits
+        self.misses += found.size - hits
+        return values, codes, found
+
+    def lookup(self, calculation, *arguments):
+        """
+        Bulk lookup of cached results.
+
+        Parameters:
+        - calculation (str): Method name, e.g. "present_value_annuity"
+        - arguments (array_like): The method's arguments in order, broadcast together
+
+        Returns:
+        tuple: (values, codes, found) flat arrays, one entry per broadcast row
+        """
+        return self.lookup_hashes(*hash_arguments(calculation, arguments, self.version))
+
+    def insert_hashes(self, keys, checks, values, codes):
+        """
+        Append results for precomputed hashes as one new segment, then evict and merge as needed.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        codes = np.broadcast_to(np.asarray(codes, dtype=np.uint8), values.shape).ravel()
+        if keys.size == 0:
+            return
+        key, check, value, code = self._newest_unique(keys, checks, values, codes)
+
+        with self._write_lock():
+            manifest = self._manifest()
+            name = f"segment-{manifest['next']:08d}"
+            self._write_segment(name, key, check, value, code)
+            manifest["next"] += 1
+            manifest["segments"].append([name, int(key.size)])
+
+            dropped = self._evict(manifest)
+            if len(manifest["segments"]) > self.max_segments:
+                merged = self._merge(manifest)
+                dropped.extend(name for name, _ in manifest["segments"])
+                manifest["segments"] = [merged]
+            self._write_manifest(manifest)
+
+        # Open memory maps in other readers stay valid after the files are unlinked
+        for name in dropped:
+            self._segments.pop(name, None)
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+    def _evict(self, manifest):
+        # Size bound, applied to the manifest in place; returns the names of segments no longer live
+        segments = manifest["segments"]
+        total = sum(size for _, size in segments)
+        if total <= self.max_entries:
+            return []
+        target = max(1, int(self.max_entries * _EVICT_TO))
+        dropped = []
+        while total - segments[0][1] >= target:
+            name, size = segments.pop(0)
+            dropped.append(name)
+            total -= size
+
+        # Trim the oldest remaining segment to the row budget. Its rows are equally old and sorted
+        # by a hash, so dropping its lowest keys evicts an arbitrary subset of them.
+        excess = total - target
+        if excess > 0:
+            name, size = segments[0]
+            segment = self._segment(name)
+            trimmed = f"segment-{manifest['next']:08d}"
+            self._write_segment(trimmed, *(getattr(segment, column)[excess:] for column in _Segment.__slots__))
+            manifest["next"] += 1
+            segments[0] = [trimmed, size - excess]
+            dropped.append(name)
+        return dropped
+
+    def _merge(self, manifest):
+        segments = [self._segment(name) for name, _ in manifest["segments"]]
+        columns = [np.concatenate([getattr(segment, column) for segment in segments]) for column in _Segment.__slots__]
+        key, check, value, code = self._newest_unique(*columns)
+        name = f"segment-{manifest['next']:08d}"
+        self._write_segment(name, key, check, value, code)
+        manifest["next"] += 1
+        return [name, int(key.size)]
+
+    def insert(self, calculation, arguments, values, codes=0):
+        """
+        Bulk insert of results.
+
+        Parameters:
+        - calculation (str): Method name
+        - arguments (sequence of array_like): The method's arguments in order, broadcast together
+        - values (array_like): The results, one per broadcast row
+        - codes (array_like): ErrorCode per row. Default is 0 (OK).
+        """
+        keys, checks = hash_arguments(calculation, arguments, self.version)
+        self.insert_hashes(keys, checks, values, codes)
+
+    def compute(self, batch, calculation, *arguments, return_errors=False):
+        """
+        Serve a batch call from the cache, computing and inserting only the rows that miss.
+
+        Parameters:
+        - batch (VectorizedFinanceCalculations): Calculator used for misses
+        - calculation (str): The batch method, e.g. "present_value_annuity"
+        - arguments (array_like): The method's arguments in order
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The results in the broadcast shape of the arguments (and the ErrorCode array if return_errors)
+        """
+        columns = np.broadcast_arrays(*(np.asarray(argument, dtype=np.float64) for argument in arguments))
+        keys, checks = hash_arguments(calculation, columns, self.version)
+        values, codes, found = self.lookup_hashes(keys, checks)
+
+        missing = np.flatnonzero(~found)
+        if missing.size:
+            computed, computed_codes = getattr(batch, calculation)(*(column.ravel()[missing] for column in columns), return_errors=True)
+            values[missing] = computed
+            codes[missing] = computed_codes
+            self.insert_hashes(keys[missing], checks[missing], computed, computed_codes)
+
+        shape = columns[0].shape
+        if return_errors:
+            return values.reshape(shape), codes.reshape(shape)
+        return values.reshape(shape)
+
+    def stats(self):
+        """
+        Returns:
+        dict: hits, misses, entries and segments
+        """
+        segments = self._live_segments()
+        return {"hits": self.hits, "misses": self.misses, "entries": sum(size for _, size in segments), "segments": len(segments)}
+
+    def clear(self):
+        with self._write_lock():
+            manifest = self._manifest()
+            dropped = [name for name, _ in manifest["segments"]]
+            manifest["segments"] = []
+            self._write_manifest(manifest)
+        for name in dropped:
+            self._segments.pop(name, None)
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+        self.hits = 0
+        self.misses = 0
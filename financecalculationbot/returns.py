@@ -0,0 +1,217 @@
+import math
+from collections import namedtuple
+
+import numpy as np
+
+#Streaming return analytics over price series
+
+ReturnChunk = namedtuple("ReturnChunk", [
+    "holding_period",
+    "cumulative",
+    "rolling",
+])
+
+
+class ReturnStream:
+    """
+    Holding-period, cumulative, annualized and rolling-window total returns over a price series
+    fed in chunks of any size.
+
+    Each period's return is (P_t + D_t - P_t-1) / P_t-1, the one-period holding_period_return,
+    with dividends reinvested. Returns are accumulated as log growth: cumulative returns are a
+    running sum carried across chunks (with compensated summation), and a rolling return is
+    the difference of the cumulative log growth window periods apart. Everything is O(n), and
+    state is the last positive price, a few floats and the last window growth levels, so memory
+    does not grow with the length of the series.
+
+    A price of 0 ends its period with a -100% return, as in holding_period_return. A period can
+    only be measured from a positive price, so the next return after a non-positive (or NaN)
+    tick bridges over it: it is measured from the last positive price, with the dividends paid
+    in between, and the cumulative return picks up from there. Rolling windows starting on such
+    a tick are NaN. Periods before the first positive price have no return and are counted in
+    invalid. Results do not depend on how the series is chunked.
+    """
+    def __init__(self, window=None, periods_per_year=252):
+        """
+        Parameters:
+        - window (int): Number of periods in the rolling window. Default is None (no rolling returns).
+        - periods_per_year (float): Periods per year used to annualize, e.g. 252 for daily closes. Default is 252.
+        """
+        if window is not None and window <= 0:
+            raise ValueError("window must be greater than 0")
+        if periods_per_year <= 0:
+            raise ValueError("periods_per_year must be greater than 0")
+        self.window = window
+        self.periods_per_year = periods_per_year
+        self.count = 0
+        self.invalid = 0
+        self._started = False
+        self._anchor_price = None
+        self._pending_dividends = 0.0
+        self._log_growth = 0.0
+        self._compensation = 0.0
+        self._last_growth = 0.0
+        self._tail = np.zeros(0)
+
+    def update(self, prices, dividends=None):
+        """
+        Consume the next chunk of the series.
+
+        Parameters:
+        - prices (array_like): Prices, continuing from the previous chunk
+        - dividends (array_like): Dividends paid at each price's time, same length. Default is None (none).
+
+        Returns:
+        ReturnChunk: holding_period, cumulative (since the first price) and rolling returns for each
+        price in the chunk; the first price of the series and rolling entries without a full window are NaN
+        """
+        prices = np.asarray(prices, dtype=np.float64).ravel()
+        if prices.size == 0:
+            return ReturnChunk(np.zeros(0), np.zeros(0), np.zeros(0))
+        size = prices.size
+        dividends = np.zeros(size) if dividends is None else np.broadcast_to(np.asarray(dividends, dtype=np.float64).ravel(), (size,))
+        positive = prices > 0
+
+        # Each period is measured from the latest positive price before it: earlier in the chunk, or carried over
+        latest = np.where(positive, np.arange(size), -1)
+        np.maximum.accumulate(latest, out=latest)
+        anchor = np.concatenate(([-1], latest[:-1]))
+        carried = anchor < 0
+        anchor = np.maximum(anchor, 0)
+        paid = np.cumsum(dividends)
+        anchor_price = np.where(carried, np.nan if self._anchor_price is None else self._anchor_price, prices[anchor])
+        paid_since = np.where(carried, paid + self._pending_dividends, paid - paid[anchor])
+        with np.errstate(all="ignore"):
+            holding = (prices + paid_since - anchor_price) / anchor_price
+            log_returns = np.log1p(holding)
+
+        # Log growth at each positive price chains from the previous one; other ticks hang off their anchor
+        steps = np.where(positive & ~np.isnan(log_returns), log_returns, 0.0)
+        chain = self._log_growth + np.cumsum(steps)
+        levels = np.where(carried, self._log_growth, chain[anchor]) + log_returns
+        if self._anchor_price is None:
+            # The first positive price of the series starts the clock
+            levels[positive & carried] = 0.0
+        cumulative = np.expm1(levels)
+
+        rolling = np.full(size, np.nan)
+        if self.window is not None:
+            history = np.concatenate((self._tail, levels))
+            ends = np.arange(self._tail.size, history.size)
+            full = ends >= self.window
+            starts = history[ends[full] - self.window]
+            with np.errstate(invalid="ignore"):
+                rolling[full] = np.where(np.isfinite(starts), np.expm1(history[ends[full]] - starts), np.nan)
+            self._tail = history[-self.window:]
+
+        periods = size if self._started else size - 1
+        self.count += periods
+        # Only periods before the first positive price are unmeasured; the clock starts at that price
+        self.invalid += int(np.count_nonzero(np.isnan(anchor_price[size - periods:])))
+        self._started = True
+
+        # Kahan summation keeps the carried log growth accurate across many chunks
+        corrected = float(np.sum(steps)) - self._compensation
+        total = self._log_growth + corrected
+        self._compensation = (total - self._log_growth) - corrected
+        self._log_growth = total
+
+        if positive.any():
+            self._anchor_price = float(prices[latest[-1]])
+            self._pending_dividends = float(paid[-1] - paid[latest[-1]])
+        else:
+            self._pending_dividends += float(paid[-1])
+        defined = np.flatnonzero(~np.isnan(levels))
+        if defined.size:
+            last = defined[-1]
+            self._last_growth = self._log_growth if positive[last] else float(levels[last])
+        return ReturnChunk(holding, cumulative, rolling)
+
+    def iter_updates(self, chunks):
+        """
+        Consume an iterator of chunks, e.g. prices read from a file piece by piece.
+
+        Parameters:
+        - chunks (iterable): Price arrays, or (prices, dividends) pairs
+
+        Returns:
+        generator: The ReturnChunk of each input chunk; the stream's totals are up to date after each one
+        """
+        for chunk in chunks:
+            yield self.update(*chunk) if isinstance(chunk, tuple) else self.update(chunk)
+
+    @property
+    def cumulative_return(self):
+        """
+        float: Total return from the first positive price to the latest price
+        """
+        return math.expm1(self._last_growth)
+
+    @property
+    def annualized_return(self):
+        """
+        float: Compound annual return over the measured periods so far (NaN before the first return)
+        """
+        periods = self.count - self.invalid
+        if periods == 0:
+            return math.nan
+        return math.expm1(self._last_growth * self.periods_per_year / periods)
+
+    def as_dict(self):
+        return {
+            "periods": self.count,
+            "invalid": self.invalid,
+            "cumulative_return": self.cumulative_return,
+            "annualized_return": self.annualized_return,
+        }
+
+
+def returns_summary(chunks, periods_per_year=252):
+    """
+    Cumulative and annualized return of a chunked series in one pass, keeping only running totals.
+
+    Parameters:
+    - chunks (iterable): Price arrays, or (prices, dividends) pairs
+    - periods_per_year (float): Periods per year used to annualize. Default is 252.
+
+    Returns:
+    dict: periods, invalid, cumulative_return and annualized_return
+    """
+    stream = ReturnStream(periods_per_year=periods_per_year)
+    for _ in stream.iter_updates(chunks):
+        pass
+    return stream.as_dict()
+
+
+def holding_period_returns(prices, dividends=None):
+    """
+    Returns:
+    ndarray: One-period total returns (P_t + D_t - P_t-1) / P_t-1; the first entry is NaN
+    """
+    return ReturnStream().update(prices, dividends).holding_period
+
+
+def cumulative_returns(prices, dividends=None):
+    """
+    Returns:
+    ndarray: Total return from the first price to each price, dividends reinvested
+    """
+    return ReturnStream().update(prices, dividends).cumulative
+
+
+def rolling_returns(prices, window, dividends=None):
+    """
+    Returns:
+    ndarray: Compound total return over the trailing window periods; NaN until a full window is available
+    """
+    return ReturnStream(window).update(prices, dividends).rolling
+
+
+def annualized_return(prices, dividends=None, periods_per_year=252):
+    """
+    Returns:
+    float: Compound annual total return over the whole series
+    """
+    stream = ReturnStream(periods_per_year=periods_per_year)
+    stream.update(prices, dividends)
+    return stream.annualized_return
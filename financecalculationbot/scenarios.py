@@ -0,0 +1,206 @@
+import inspect
+from collections import namedtuple
+
+import numpy as np
+
+from .validation import ErrorCode
+from .vectorized import VectorizedFinanceCalculations
+
+#Scenario grid revaluation
+
+ScenarioAggregates = namedtuple("ScenarioAggregates", [
+    "total",
+    "minimum",
+    "maximum",
+    "invalid",
+])
+
+
+class ScenarioSet:
+    """
+    Scenario matrix: one row per scenario of shocks added to the instruments' inputs.
+
+    - parallel_shift: added to every nominal_rate
+    - twist: change in the rate shock per year of term, pivoting at the engine's twist_pivot, so a
+      positive twist steepens: nominal_rate += twist * (time - twist_pivot). Calculations without a
+      time argument sit at the pivot and only see the parallel shift.
+    - growth_shock: added to every growth rate
+    - inflation_shock: added to every inflation_rate
+    """
+    SHOCKS = ("parallel_shift", "twist", "growth_shock", "inflation_shock")
+
+    def __init__(self, parallel_shift=0.0, twist=0.0, growth_shock=0.0, inflation_shock=0.0):
+        """
+        Parameters:
+        - parallel_shift, twist, growth_shock, inflation_shock (array_like): Shocks per scenario (as decimals); scalars are broadcast to the number of scenarios
+        """
+        shocks = np.broadcast_arrays(*(np.atleast_1d(np.asarray(shock, dtype=np.float64)) for shock in (parallel_shift, twist, growth_shock, inflation_shock)))
+        if shocks[0].ndim != 1:
+            raise ValueError("Shocks must be scalars or 1-D arrays")
+        self.parallel_shift, self.twist, self.growth_shock, self.inflation_shock = (np.ascontiguousarray(shock) for shock in shocks)
+
+    @classmethod
+    def grid(cls, parallel_shifts=(0.0,), twists=(0.0,), growth_shocks=(0.0,), inflation_shocks=(0.0,)):
+        """
+        Every combination of the given shock levels, e.g. 41 shifts x 5 twists x 11 growth shocks = 2,255 scenarios.
+
+        Returns:
+        ScenarioSet: The scenarios, parallel shift varying slowest
+        """
+        mesh = np.meshgrid(*(np.asarray(levels, dtype=np.float64) for levels in (parallel_shifts, twists, growth_shocks, inflation_shocks)), indexing="ij")
+        return cls(*(axis.ravel() for axis in mesh))
+
+    @classmethod
+    def from_matrix(cls, matrix):
+        """
+        Build scenarios from a (scenarios, 4) matrix with columns in SHOCKS order.
+        """
+        matrix = np.asarray(matrix, dtype=np.float64)
+        if matrix.ndim != 2 or matrix.shape[1] != len(cls.SHOCKS):
+            raise ValueError(f"Scenario matrix must have shape (scenarios, {len(cls.SHOCKS)})")
+        return cls(*matrix.T)
+
+    def __len__(self):
+        return self.parallel_shift.shape[0]
+
+    def __getitem__(self, index):
+        return ScenarioSet(*(getattr(self, shock)[index] for shock in self.SHOCKS))
+
+
+class ScenarioEngine:
+    """
+    Revalues a book under every scenario of a ScenarioSet as one broadcast computation.
+
+    Instrument arguments become a (1, instruments) row and shocks a (scenarios, 1) column, so a
+    single VectorizedFinanceCalculations call values a whole block of the (scenario x instrument)
+    grid. Works with any batch calculation whose shocked inputs are named nominal_rate, growth and
+    inflation_rate (e.g. dividend_discount_model, present_value_annuity, fisher_effect). Scenarios
+    are processed in blocks sized so the temporaries stay within memory_budget bytes.
+    """
+    def __init__(self, batch=None, memory_budget=256 * 2**20, twist_pivot=5.0):
+        """
+        Parameters:
+        - batch (VectorizedFinanceCalculations): Calculator to use. Default is a new instance.
+        - memory_budget (int): Approximate bytes of working memory per block of scenarios. Default is 256 MB.
+        - twist_pivot (float): Term in years at which a twist leaves rates unchanged. Default is 5.
+        """
+        if memory_budget <= 0:
+            raise ValueError("memory_budget must be greater than 0")
+        self.batch = batch if batch is not None else VectorizedFinanceCalculations()
+        self.memory_budget = memory_budget
+        self.twist_pivot = twist_pivot
+
+    def _prepare(self, calculation, arguments):
+        method = getattr(self.batch, calculation, None)
+        if calculation.startswith("_") or not callable(method):
+            raise ValueError(f"Unknown calculation: {calculation}")
+        parameters = inspect.signature(method).parameters
+        if "dividends" in parameters:
+            raise ValueError(f"{calculation} takes a dividend matrix and cannot be run on a scenario grid")
+        unknown = set(arguments) - set(parameters) - {"return_errors"}
+        if unknown:
+            raise ValueError(f"{calculation} has no argument(s) {', '.join(sorted(unknown))}")
+
+        columns = {name: np.atleast_1d(np.asarray(value, dtype=np.float64)) for name, value in arguments.items()}
+        instruments = np.broadcast_shapes(*(column.shape for column in columns.values())) if columns else (1,)
+        if len(instruments) != 1:
+            raise ValueError("Instrument arguments must be scalars or 1-D arrays")
+        columns = {name: np.broadcast_to(column, instruments)[None, :] for name, column in columns.items()}
+        return method, columns, instruments[0]
+
+    def _block_size(self, instruments, arguments):
+        # Each grid cell holds the broadcast arguments plus a few result and mask temporaries
+        bytes_per_scenario = max(instruments, 1) * 8 * (arguments + 6)
+        return max(1, self.memory_budget // bytes_per_scenario)
+
+    def _shocked(self, columns, scenarios):
+        shocked = dict(columns)
+        if "nominal_rate" in columns:
+            shift = scenarios.parallel_shift[:, None]
+            if "time" in columns:
+                shift = shift + scenarios.twist[:, None] * (columns["time"] - self.twist_pivot)
+            shocked["nominal_rate"] = columns["nominal_rate"] + shift
+        if "growth" in columns:
+            shocked["growth"] = columns["growth"] + scenarios.growth_shock[:, None]
+        if "inflation_rate" in columns:
+            shocked["inflation_rate"] = columns["inflation_rate"] + scenarios.inflation_shock[:, None]
+        return shocked
+
+    def iter_blocks(self, calculation, scenarios, **arguments):
+        """
+        Yield the grid block by block.
+
+        Parameters:
+        - calculation (str): VectorizedFinanceCalculations method, e.g. "dividend_discount_model"
+        - scenarios (ScenarioSet): The scenarios
+        - arguments (array_like): The method's arguments, one value per instrument (scalars are shared)
+
+        Returns:
+        generator: (start, values, error_codes) with values of shape (block scenarios, instruments)
+        """
+        method, columns, instruments = self._prepare(calculation, arguments)
+        block = self._block_size(instruments, len(columns))
+        for start in range(0, len(scenarios), block):
+            values, codes = method(**self._shocked(columns, scenarios[start:start + block]), return_errors=True)
+            yield start, values, codes
+
+    def evaluate(self, calculation, scenarios, return_errors=False, **arguments):
+        """
+        Value every instrument under every scenario.
+
+        Parameters:
+        - calculation (str): VectorizedFinanceCalculations method, e.g. "present_value_annuity"
+        - scenarios (ScenarioSet): The scenarios
+        - return_errors (bool): Also return the ErrorCode grid. Default is False.
+        - arguments (array_like): The method's arguments, one value per instrument (scalars are shared)
+
+        Returns:
+        ndarray: (scenarios, instruments) values, NaN where a scenario makes the inputs invalid (and the ErrorCode grid if return_errors)
+        """
+        _, columns, instruments = self._prepare(calculation, arguments)
+        values = np.empty((len(scenarios), instruments))
+        codes = np.empty((len(scenarios), instruments), dtype=np.uint8)
+        for start, block_values, block_codes in self.iter_blocks(calculation, scenarios, **arguments):
+            stop = start + block_values.shape[0]
+            values[start:stop] = block_values
+            codes[start:stop] = block_codes
+        if return_errors:
+            return values, codes
+        return values
+
+    def aggregate(self, calculation, scenarios, weights=None, **arguments):
+        """
+        Book-level results per scenario, streamed block by block so the full grid is never held.
+
+        Parameters:
+        - calculation (str): VectorizedFinanceCalculations method
+        - scenarios (ScenarioSet): The scenarios
+        - weights (array_like): Position size per instrument applied to the total. Default is None (1 each).
+        - arguments (array_like): The method's arguments, one value per instrument
+
+        Returns:
+        ScenarioAggregates: total (weighted sum of valid values), minimum, maximum and invalid (count) per scenario
+        """
+        total, minimum, maximum, invalid = (np.empty(len(scenarios)) for _ in ScenarioAggregates._fields)
+        for start, values, codes in self.iter_blocks(calculation, scenarios, **arguments):
+            stop = start + values.shape[0]
+            valid = codes == ErrorCode.OK
+            weighted = values if weights is None else values * np.asarray(weights, dtype=np.float64)
+            total[start:stop] = np.where(valid, weighted, 0.0).sum(axis=1)
+            minimum[start:stop] = np.where(valid, values, np.inf).min(axis=1, initial=np.inf)
+            maximum[start:stop] = np.where(valid, values, -np.inf).max(axis=1, initial=-np.inf)
+            invalid[start:stop] = np.count_nonzero(~valid, axis=1)
+
+        # Scenarios where every instrument is invalid have no minimum or maximum
+        minimum[np.isinf(minimum)] = np.nan
+        maximum[np.isinf(maximum)] = np.nan
+        return ScenarioAggregates(total, minimum, maximum, invalid.astype(np.int64))
+
+    def evaluate_instruments(self, instruments, scenarios, return_errors=False):
+        """
+        Value an InstrumentArray under every scenario.
+
+        Returns:
+        ndarray: (scenarios, instruments) values (and the ErrorCode grid if return_errors)
+        """
+        return self.evaluate(instruments.instrument_type.calculation, scenarios, return_errors, **instruments.columns)
@@ -0,0 +1,148 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .annuity_engine import AnnuityFactors
+from .validation import ErrorCode
+from .vectorized import VectorizedFinanceCalculations
+
+#Analytic rate sensitivities
+
+Sensitivities = namedtuple("Sensitivities", [
+    "value",
+    "macaulay_duration",
+    "modified_duration",
+    "convexity",
+    "dv01",
+])
+
+
+class SensitivityEngine:
+    """
+    Value, Macaulay and modified duration, convexity and DV01 in one pass, from the same
+    discount factors as the valuation, instead of bumping and repricing.
+
+    Durations are in years and convexity in years squared, both with respect to the annual
+    nominal rate; DV01 is the value change for a one basis point fall in that rate. Every
+    method is vectorized across instruments and returns NaN where the inputs are invalid.
+    """
+    def __init__(self):
+        self.batch = VectorizedFinanceCalculations()
+
+    @staticmethod
+    def _assemble(value, first_derivative, second_derivative, periodic_growth, compounding_frequency, codes):
+        # first/second_derivative are d/di and d2/di2 of value with respect to the periodic rate i = r / m
+        with np.errstate(all="ignore"):
+            modified_duration = -first_derivative / (value * compounding_frequency)
+            macaulay_duration = modified_duration * periodic_growth
+            convexity = second_derivative / (value * compounding_frequency ** 2)
+            dv01 = modified_duration * value * 1e-4
+        invalid = codes != ErrorCode.OK
+        return Sensitivities(*(np.where(invalid, np.nan, array) for array in (value, macaulay_duration, modified_duration, convexity, dv01)))
+
+    # Present Value Single Cash Flow
+    def present_value_single_cashflow(self, future_value, nominal_rate, time, compounding_frequency=1):
+        """
+        Calculate the present value of single cash flows and their rate sensitivities.
+
+        Parameters:
+        - future_value (array_like): The future values of the cash flows
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+
+        Returns:
+        Sensitivities: value, macaulay_duration, modified_duration, convexity and dv01 arrays
+        """
+        future_value, nominal_rate, time, compounding_frequency = self.batch._as_arrays(future_value, nominal_rate, time, compounding_frequency)
+        value, codes = self.batch.present_value_single_cashflow(future_value, nominal_rate, time, compounding_frequency, return_errors=True)
+        periods = time * compounding_frequency
+        growth = 1 + nominal_rate / compounding_frequency
+        first = -periods * value / growth
+        second = periods * (periods + 1) * value / growth ** 2
+        return self._assemble(value, first, second, growth, compounding_frequency, codes)
+
+    # Present Value of an Annuity
+    def present_value_annuity(self, annual_payment, nominal_rate, time, compounding_frequency=1):
+        """
+        Calculate the present value of annuities and their rate sensitivities.
+
+        Uses the closed forms A = (1 - (1 + i)^-n) / i, A' = (n (1 + i)^-(n+1) - A) / i and
+        A'' = (-n (n + 1) (1 + i)^-(n+2) - 2 A') / i, all from one (1 + i)^-n factor.
+
+        Parameters:
+        - annual_payment (array_like): The payments received each period
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+
+        Returns:
+        Sensitivities: value, macaulay_duration, modified_duration, convexity and dv01 arrays
+        """
+        annual_payment, nominal_rate, time, compounding_frequency = self.batch._as_arrays(annual_payment, nominal_rate, time, compounding_frequency)
+        codes = self.batch._error_codes(
+            (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (time <= 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        factors = AnnuityFactors(nominal_rate, compounding_frequency, time)
+        i = factors.periodic_rate
+        n = time * compounding_frequency
+        growth = 1 + i
+        with np.errstate(all="ignore"):
+            annuity = (1 - factors.discount) / i
+            first = (n * factors.discount / growth - annuity) / i
+            second = (-n * (n + 1) * factors.discount / growth ** 2 - 2 * first) / i
+        return self._assemble(annual_payment * annuity, annual_payment * first, annual_payment * second, growth, compounding_frequency, codes)
+
+    # Multi Stage DDM
+    def multi_stage_ddm_with_terminal_value(self, dividends, nominal_rate, terminal_value, lengths=None):
+        """
+        Calculate multi-stage DDM intrinsic values and their discount rate sensitivities.
+
+        The value and both derivatives come from one discounted cash flow matrix, validated as in
+        VectorizedFinanceCalculations.multi_stage_ddm_with_terminal_value.
+
+        Parameters:
+        - dividends (array_like): Dividend matrix of shape (stocks, years); a 1-D array is a single stock
+        - nominal_rate (array_like): The annual discount rate per stock (as decimals)
+        - terminal_value (array_like): The estimated stock price per stock at the end of its last dividend year
+        - lengths (array_like): Number of dividend years per stock for ragged schedules. Default is None (all years).
+
+        Returns:
+        Sensitivities: value, macaulay_duration, modified_duration, convexity and dv01 per stock
+        """
+        dividends = np.asarray(dividends, dtype=np.float64)
+        single_stock = dividends.ndim == 1
+        dividends = np.atleast_2d(dividends)
+        stocks, years = dividends.shape
+
+        nominal_rate, terminal_value = (np.broadcast_to(np.asarray(arg, dtype=np.float64), (stocks,)) for arg in (nominal_rate, terminal_value))
+        lengths = np.full(stocks, years, dtype=np.intp) if lengths is None else np.broadcast_to(np.asarray(lengths, dtype=np.intp), (stocks,))
+        if np.any((lengths < 0) | (lengths > years)):
+            raise ValueError("lengths must be between 0 and the number of dividend columns")
+
+        # Cash flow matrix with the terminal value added to each stock's last year
+        cash_flows = np.where(np.arange(years) < lengths[:, None], dividends, 0.0)
+        codes = self.batch._error_codes(
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (terminal_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (np.any(cash_flows < 0, axis=1), ErrorCode.INVALID_AMOUNT))
+        with_terminal = lengths > 0
+        cash_flows[np.flatnonzero(with_terminal), lengths[with_terminal] - 1] += terminal_value[with_terminal]
+        immediate = np.where(with_terminal, 0.0, terminal_value)
+
+        growth = 1 + nominal_rate
+        t = np.arange(1, years + 1, dtype=np.float64)
+        with np.errstate(all="ignore"):
+            discount = np.cumprod(np.broadcast_to((1 / growth)[:, None], (stocks, years)), axis=1)
+            present = cash_flows * discount
+            first = -np.sum(t * present, axis=1) / growth
+            second = np.sum(t * (t + 1) * present, axis=1) / growth ** 2
+        value = np.sum(present, axis=1) + immediate
+
+        result = self._assemble(value, first, second, growth, 1.0, codes)
+        if single_stock:
+            return Sensitivities(*(array[0] for array in result))
+        return result
@@ -0,0 +1,232 @@
+import argparse
+import asyncio
+import inspect
+import json
+import math
+
+import numpy as np
+
+from .validation import ErrorCode
+from .vectorized import VectorizedFinanceCalculations
+
+#Asyncio HTTP valuation service with request micro-batching
+
+class MicroBatcher:
+    """
+    Collects concurrent requests for one calculation and values them together.
+
+    The first request of a batch starts a timer of window seconds; every request that
+    arrives before it fires (up to max_batch) is valued in the same vectorized call.
+    This bounds the added latency to window while amortising per-call overhead.
+    """
+    def __init__(self, batch, calculation, window=0.002, max_batch=4096):
+        self.batch = batch
+        self.calculation = calculation
+        self.window = window
+        self.max_batch = max_batch
+        self.parameters = [
+            parameter for name, parameter in inspect.signature(getattr(batch, calculation)).parameters.items()
+            if name not in ("return_errors", "lengths")
+        ]
+        self._pending = []
+        self._timer = None
+
+    def submit(self, arguments):
+        """
+        Queue one request.
+
+        Parameters:
+        - arguments (dict): Argument name to value for the calculation
+
+        Returns:
+        asyncio.Future: Resolves to (result, error_code)
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((arguments, future))
+        if len(self._pending) >= self.max_batch:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self.flush)
+        return future
+
+    def _column(self, pending, parameter):
+        values = []
+        for arguments, _ in pending:
+            if parameter.name in arguments:
+                values.append(arguments[parameter.name])
+            elif parameter.default is not inspect.Parameter.empty:
+                values.append(parameter.default)
+            else:
+                raise ValueError(f"Missing argument {parameter.name!r} for {self.calculation}")
+        return values
+
+    def _arguments(self, pending):
+        arguments = []
+        kwargs = {}
+        for parameter in self.parameters:
+            values = self._column(pending, parameter)
+            if parameter.name == "dividends":
+                # Ragged dividend lists are padded into a matrix with a length vector
+                lengths = np.array([len(row) for row in values], dtype=np.intp)
+                matrix = np.zeros((len(values), int(lengths.max(initial=0))))
+                for i, row in enumerate(values):
+                    matrix[i, :len(row)] = row
+                arguments.append(matrix)
+                kwargs["lengths"] = lengths
+            else:
+                arguments.append(np.asarray(values, dtype=np.float64))
+        return arguments, kwargs
+
+    def flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+
+        try:
+            arguments, kwargs = self._arguments(pending)
+            results, codes = getattr(self.batch, self.calculation)(*arguments, return_errors=True, **kwargs)
+        except (TypeError, ValueError):
+            # A malformed request must not fail its neighbours; value the batch one row at a time
+            for row in pending:
+                self._flush_single(row)
+            return
+        except Exception as error:
+            # Anything else is a server-side failure; every waiting client gets it rather than hanging
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for (_, future), result, code in zip(pending, results.tolist(), codes.tolist()):
+            if not future.done():
+                future.set_result((result, code))
+
+    def _flush_single(self, row):
+        _, future = row
+        try:
+            arguments, kwargs = self._arguments([row])
+            results, codes = getattr(self.batch, self.calculation)(*arguments, return_errors=True, **kwargs)
+        except (TypeError, ValueError) as error:
+            if not future.done():
+                future.set_exception(ValueError(str(error)))
+            return
+        except Exception as error:
+            if not future.done():
+                future.set_exception(error)
+            return
+        if not future.done():
+            future.set_result((results.tolist()[0], codes.tolist()[0]))
+
+
+class ValuationService:
+    """
+    Minimal HTTP/1.1 server exposing each VectorizedFinanceCalculations method.
+
+    POST /<calculation> with a JSON object of arguments, e.g.
+        POST /present_value_annuity {"annual_payment": 50, "nominal_rate": 0.05, "time": 10}
+    returns {"result": 386.08..., "error_code": 0, "error": "OK"}; invalid rows return a null
+    result and a non-zero error_code. GET /calculations lists the endpoints and GET /health
+    answers "ok". Concurrent requests to the same endpoint are micro-batched.
+    """
+    def __init__(self, host="127.0.0.1", port=8080, window=0.002, max_batch=4096):
+        self.host = host
+        self.port = port
+        self.batch = VectorizedFinanceCalculations()
+        self.batchers = {
+            name: MicroBatcher(self.batch, name, window, max_batch)
+            for name, _ in inspect.getmembers(VectorizedFinanceCalculations, inspect.isfunction)
+            if not name.startswith("_")
+        }
+        self._server = None
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = json.dumps(payload).encode()
+        reason = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error"}[status]
+        headers = (
+            f"HTTP/1.1 {status} {reason}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(headers.encode() + body)
+        await writer.drain()
+
+    async def _route(self, method, path, body):
+        name = path.strip("/")
+        if method == "GET" and name == "health":
+            return 200, "ok"
+        if method == "GET" and name == "calculations":
+            return 200, sorted(self.batchers)
+        if name not in self.batchers:
+            return 404, {"error": f"Unknown calculation: {name}"}
+        if method != "POST":
+            return 405, {"error": "Use POST"}
+
+        try:
+            arguments = json.loads(body or b"{}")
+            if not isinstance(arguments, dict):
+                raise ValueError("Request body must be a JSON object")
+            result, code = await self.batchers[name].submit(arguments)
+        except ValueError as error:
+            return 400, {"error": str(error)}
+        except Exception as error:
+            return 500, {"error": f"{type(error).__name__}: {error}"}
+
+        return 200, {
+            "result": None if math.isnan(result) else result,
+            "error_code": code,
+            "error": ErrorCode(code).name,
+        }
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, version = request_line.decode("latin-1").split()
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                keep_alive = headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                status, payload = await self._route(method, path, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        return self._server
+
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve FinanceCalculations over HTTP with request micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--window", type=float, default=0.002, help="Batching window in seconds. Default: %(default)s")
+    parser.add_argument("--max-batch", type=int, default=4096, help="Flush a batch early at this many requests. Default: %(default)s")
+    args = parser.parse_args(argv)
+    asyncio.run(ValuationService(args.host, args.port, args.window, args.max_batch).serve_forever())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+import numpy as np
+
+#Implied rate solvers
+
+class RateSolver:
+    """
+    Vectorized safeguarded Newton solver for implied rates.
+
+    Each element keeps a bracket [lower, upper] around its root; a Newton step that leaves
+    the bracket is replaced by bisection, so every element converges even from a poor guess.
+    With warm_start=True the previous call's solution seeds the next one, which is the
+    usual case when re-solving the same instruments along a price time series.
+    """
+    def __init__(self, tolerance=1e-12, max_iterations=100, lower=1e-12, upper=10.0):
+        """
+        Parameters:
+        - tolerance (float): Convergence tolerance on the rate. Default is 1e-12.
+        - max_iterations (int): Maximum Newton/bisection iterations. Default is 100.
+        - lower (float): Lowest rate searched (rates must be greater than 0). Default is 1e-12.
+        - upper (float): Highest rate searched. Default is 10.0 (1000%).
+        """
+        self.tolerance = tolerance
+        self.max_iterations = max_iterations
+        self.lower = lower
+        self.upper = upper
+        self.last_solution = None
+        self.last_iterations = 0
+
+    def _initial_guess(self, guess, warm_start, shape, default):
+        if guess is not None:
+            guess = np.broadcast_to(np.asarray(guess, dtype=np.float64), shape)
+        elif warm_start and self.last_solution is not None and self.last_solution.shape == shape:
+            guess = np.where(np.isnan(self.last_solution), default, self.last_solution)
+        else:
+            guess = np.broadcast_to(default, shape)
+        return np.clip(guess, self.lower, self.upper)
+
+    def _solve(self, objective, guess):
+        """
+        Find rates where objective(rate) == 0.
+
+        objective returns (value, derivative) and must be decreasing in the rate, which holds
+        for every present value. Elements with no root inside [lower, upper] return NaN.
+        """
+        lower = np.full(guess.shape, self.lower)
+        upper = np.full(guess.shape, self.upper)
+        f_lower, _ = objective(lower)
+        f_upper, _ = objective(upper)
+        solvable = (f_lower >= 0) & (f_upper <= 0)
+
+        rate = guess.copy()
+        active = solvable.copy()
+        iterations = 0
+        with np.errstate(all="ignore"):
+            while iterations < self.max_iterations and active.any():
+                iterations += 1
+                value, derivative = objective(rate)
+
+                # Tighten the bracket: value > 0 means the root lies above rate
+                above = value > 0
+                lower = np.where(active & above, rate, lower)
+                upper = np.where(active & ~above, rate, upper)
+
+                newton = rate - value / derivative
+                converged = (np.abs(newton - rate) <= self.tolerance * np.maximum(1.0, np.abs(rate))) | (value == 0)
+                outside = ~np.isfinite(newton) | (newton < lower) | (newton > upper)
+                step = np.where(outside & ~converged, 0.5 * (lower + upper), newton)
+
+                rate = np.where(active, step, rate)
+                active &= ~converged
+
+        self.last_iterations = iterations
+        return np.where(solvable, rate, np.nan)
+
+    # Implied Rate of an Annuity
+    def implied_rate_annuity(self, present_value, annual_payment, time, compounding_frequency=1, guess=None, warm_start=False):
+        """
+        Solve present_value_annuity(annual_payment, rate, time, compounding_frequency) == present_value for the rate.
+
+        Parameters:
+        - present_value (array_like): The observed present values of the annuities
+        - annual_payment (array_like): The payments received each period
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - guess (array_like): Starting rates. Default is None (warm start or 5%).
+        - warm_start (bool): Start from the previous call's solution when it has the same shape. Default is False.
+
+        Returns:
+        ndarray: The implied annual rates (as decimals), NaN where no positive rate reproduces the present value
+        """
+        present_value, annual_payment, time, compounding_frequency = np.broadcast_arrays(
+            *(np.asarray(arg, dtype=np.float64) for arg in (present_value, annual_payment, time, compounding_frequency)))
+        periods = time * compounding_frequency
+        invalid = (present_value <= 0) | (annual_payment <= 0) | (time <= 0) | (compounding_frequency <= 0)
+
+        def objective(rate):
+            periodic_rate = rate / compounding_frequency
+            discount = (1 + periodic_rate) ** -periods
+            annuity = (1 - discount) / periodic_rate
+            # d(annuity)/d(periodic_rate), then chain rule through rate / compounding_frequency
+            slope = (periods * discount / (1 + periodic_rate) - annuity) / periodic_rate
+            return annual_payment * annuity - present_value, annual_payment * slope / compounding_frequency
+
+        rate = self._solve(objective, self._initial_guess(guess, warm_start, present_value.shape, 0.05))
+        rate = np.where(invalid, np.nan, rate)
+        self.last_solution = rate
+        return rate
+
+    # Implied Discount Rate of a Multi Stage DDM
+    def implied_rate_multi_stage_ddm(self, price, dividends, terminal_value, lengths=None, guess=None, warm_start=False):
+        """
+        Solve multi_stage_ddm_with_terminal_value(dividends, rate, terminal_value) == price for the rate.
+
+        Parameters:
+        - price (array_like): The market price per stock
+        - dividends (array_like): Dividend matrix of shape (stocks, years); a 1-D array is a single stock
+        - terminal_value (array_like): The estimated stock price per stock at the end of its last dividend year
+        - lengths (array_like): Number of dividend years per stock for ragged schedules. Default is None (all years).
+        - guess (array_like): Starting rates. Default is None (warm start or 8%).
+        - warm_start (bool): Start from the previous call's solution when it has the same shape. Default is False.
+
+        Returns:
+        ndarray: The implied discount rate per stock, NaN where no positive rate reproduces the price
+        """
+        dividends = np.asarray(dividends, dtype=np.float64)
+        single_stock = dividends.ndim == 1
+        dividends = np.atleast_2d(dividends)
+        stocks, years = dividends.shape
+
+        price, terminal_value = (np.broadcast_to(np.asarray(arg, dtype=np.float64), (stocks,)) for arg in (price, terminal_value))
+        lengths = np.full(stocks, years, dtype=np.intp) if lengths is None else np.broadcast_to(np.asarray(lengths, dtype=np.intp), (stocks,))
+        dividends = np.where(np.arange(years) < lengths[:, None], dividends, 0.0)
+        invalid = (price <= 0) | (terminal_value <= 0) | np.any(dividends < 0, axis=1)
+
+        exponents = np.arange(1, years + 1, dtype=np.float64)
+        terminal_exponents = lengths.astype(np.float64)
+
+        def objective(rate):
+            log_growth = np.log1p(rate)[:, None]
+            discount = np.exp(-exponents * log_growth)
+            terminal_discount = np.exp(-terminal_exponents * log_growth[:, 0])
+            value = np.sum(dividends * discount, axis=1) + terminal_value * terminal_discount
+            slope = -(np.sum(exponents * dividends * discount, axis=1) + terminal_exponents * terminal_value * terminal_discount) / (1 + rate)
+            return value - price, slope
+
+        rate = self._solve(objective, self._initial_guess(guess, warm_start, (stocks,), 0.08))
+        rate = np.where(invalid, np.nan, rate)
+        self.last_solution = rate
+        if single_stock:
+            return rate[0]
+        return rate
@@ -0,0 +1,50 @@
+from enum import IntEnum
+
+#Structured validation results shared by the scalar and vectorized calculators
+
+class ErrorCode(IntEnum):
+    """
+    Reason an input row was rejected.
+
+    Vectorized methods report these as a uint8 array alongside the (NaN-filled) values,
+    scalar methods attach them to InvalidInputError. OK (0) marks a valid row.
+    """
+    OK = 0
+    INVALID_AMOUNT = 1
+    INVALID_RATE = 2
+    INVALID_TIME = 3
+    INVALID_FREQUENCY = 4
+    RATE_NOT_ABOVE_GROWTH = 5
+
+
+class InvalidInputError(ValueError):
+    """
+    Raised by FinanceCalculations(raise_on_invalid=True) in place of returning an "Invalid Input" string.
+
+    Attributes:
+    - code (ErrorCode): The first failed check, in argument order
+    - message (str): The same human-readable message the string-returning mode produces
+    """
+    def __init__(self, message, code):
+        super().__init__(message)
+        self.message = message
+        self.code = ErrorCode(code)
+
+
+def first_error(*checks):
+    """
+    Return the code of the first failed check.
+
+    Only called once a method already knows its inputs are invalid, so the valid hot path
+    never builds the check tuples.
+
+    Parameters:
+    - checks (tuple): (failed, code) pairs in argument order
+
+    Returns:
+    ErrorCode: The code of the first pair whose failed flag is true
+    """
+    for failed, code in checks:
+        if failed:
+            return code
+    return ErrorCode.OK
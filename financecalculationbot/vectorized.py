@@ -0,0 +1,581 @@
+import numpy as np
+
+from .annuity_engine import AnnuityFactors, growing_stream_factor
+from .calculations import _is_curve
+from .validation import ErrorCode
+
+#Vectorized counterparts of the FinanceCalculations formulas
+
+class VectorizedFinanceCalculations:
+    """
+    Array versions of the FinanceCalculations time value of money methods.
+
+    Every argument may be a scalar or a NumPy array; arguments are broadcast
+    against each other and the result is a float64 array of the broadcast shape.
+    Rows that fail validation are returned as NaN instead of an error string; pass
+    return_errors=True to also get a uint8 array of ErrorCode values (0 where valid).
+    """
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def _as_arrays(*args):
+        return np.broadcast_arrays(*(np.asarray(arg, dtype=np.float64) for arg in args))
+
+    @staticmethod
+    def _error_codes(*checks):
+        # Later checks are written first so the first failed check in argument order wins
+        codes = np.zeros(checks[0][0].shape, dtype=np.uint8)
+        for failed, code in reversed(checks):
+            np.putmask(codes, failed, code)
+        return codes
+
+    @staticmethod
+    def _finish(result, codes, return_errors):
+        result = np.where(codes != ErrorCode.OK, np.nan, result)
+        if return_errors:
+            return result, codes
+        return result
+
+    # Present Value Single Cash Flow
+    def present_value_single_cashflow(self, future_value, nominal_rate, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the present value of single cash flows with variable compounding.
+
+        Parameters:
+        - future_value (array_like): The future values of the cash flows
+        - nominal_rate (array_like or YieldCurve): The annual interest rates (as decimals), or a curve to discount off
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually). Ignored for a curve.
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The present values, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        if _is_curve(nominal_rate):
+            future_value, time = self._as_arrays(future_value, time)
+            codes = self._error_codes(
+                (future_value < 0, ErrorCode.INVALID_AMOUNT),
+                (time < 0, ErrorCode.INVALID_TIME))
+            return self._finish(future_value * nominal_rate.discount_factor(np.maximum(time, 0)), codes, return_errors)
+
+        future_value, nominal_rate, time, compounding_frequency = self._as_arrays(future_value, nominal_rate, time, compounding_frequency)
+        codes = self._error_codes(
+            (future_value < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate < 0, ErrorCode.INVALID_RATE),
+            (time < 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        with np.errstate(all="ignore"):
+            result = future_value / (1 + nominal_rate / compounding_frequency) ** (time * compounding_frequency)
+        return self._finish(result, codes, return_errors)
+
+    # Future Value Single Cash Flow
+    def future_value_single_cashflow(self, present_value, nominal_rate, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the future value of single cash flows with variable compounding.
+
+        Parameters:
+        - present_value (array_like): The present values of the cash flows
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The future values, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        present_value, nominal_rate, time, compounding_frequency = self._as_arrays(present_value, nominal_rate, time, compounding_frequency)
+        codes = self._error_codes(
+            (present_value < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate < 0, ErrorCode.INVALID_RATE),
+            (time < 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        with np.errstate(all="ignore"):
+            result = present_value * (1 + nominal_rate / compounding_frequency) ** (time * compounding_frequency)
+        return self._finish(result, codes, return_errors)
+
+    # Interest Rate Single Cash Flow
+    def interest_rate_single_cashflow(self, present_value, future_value, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the annual interest rate of single cash flows with variable compounding.
+
+        Parameters:
+        - present_value (array_like): The present values of the cash flows
+        - future_value (array_like): The future values of the cash flows
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The annual interest rates (as decimals), NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        present_value, future_value, time, compounding_frequency = self._as_arrays(present_value, future_value, time, compounding_frequency)
+        codes = self._error_codes(
+            (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (time <= 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        with np.errstate(all="ignore"):
+            result = ((future_value / present_value) ** (1 / (time * compounding_frequency)) - 1) * compounding_frequency
+        return self._finish(result, codes, return_errors)
+
+    # Number of Years Single Cash Flow
+    def number_of_years_single_cashflow(self, present_value, future_value, nominal_rate, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the number of years for single cash flows to reach a future value with variable compounding.
+
+        Parameters:
+        - present_value (array_like): The present values of the cash flows
+        - future_value (array_like): The future values of the cash flows
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The number of years needed, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        present_value, future_value, nominal_rate, compounding_frequency = self._as_arrays(present_value, future_value, nominal_rate, compounding_frequency)
+        codes = self._error_codes(
+            (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        with np.errstate(all="ignore"):
+            result = (1 / compounding_frequency) * (np.log(future_value / present_value) / np.log(1 + nominal_rate / compounding_frequency))
+        return self._finish(result, codes, return_errors)
+
+    # Effective Annual Rate
+    def effective_annual_rate(self, nominal_rate, compounding_frequency, return_errors=False):
+        """
+        Calculate effective annual rates given nominal rates and compounding frequencies.
+
+        Parameters:
+        - nominal_rate (array_like): The nominal annual interest rates (as decimals)
+        - compounding_frequency (array_like): Number of compounding periods per year
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The effective annual rates (as decimals), NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        nominal_rate, compounding_frequency = self._as_arrays(nominal_rate, compounding_frequency)
+        codes = self._error_codes(
+            (nominal_rate < 0, ErrorCode.INVALID_RATE),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        with np.errstate(all="ignore"):
+            result = ((1 + nominal_rate / compounding_frequency) ** compounding_frequency) - 1
+        return self._finish(result, codes, return_errors)
+
+    # Present Value of a Perpetuity
+    def present_value_perpetuity(self, annual_payment, nominal_rate, return_errors=False):
+        """
+        Calculate the present value of perpetuities.
+
+        Parameters:
+        - annual_payment (array_like): The payments received each year
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The present values of the perpetuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        annual_payment, nominal_rate = self._as_arrays(annual_payment, nominal_rate)
+        codes = self._error_codes(
+            (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE))
+
+        result = annual_payment * growing_stream_factor(nominal_rate)
+        return self._finish(result, codes, return_errors)
+
+    # PV Perpetuity (Starting Today)
+    def pv_perpetuity_starting_today(self, annual_payment, nominal_rate, return_errors=False):
+        """
+        Calculate the present value of perpetuities starting today.
+
+        Parameters:
+        - annual_payment (array_like): The payments received each year
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The present values of the perpetuities starting today, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        annual_payment, nominal_rate = self._as_arrays(annual_payment, nominal_rate)
+        codes = self._error_codes(
+            (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE))
+
+        result = annual_payment * growing_stream_factor(nominal_rate, due=True)
+        return self._finish(result, codes, return_errors)
+
+    # Present Value of an Annuity
+    def present_value_annuity(self, annual_payment, nominal_rate, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the present value of annuities with variable compounding.
+
+        Parameters:
+        - annual_payment (array_like): The payments received each year
+        - nominal_rate (array_like or YieldCurve): The annual interest rates (as decimals), or a curve to discount each payment off
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The present values of the annuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        if _is_curve(nominal_rate):
+            annual_payment, time, compounding_frequency = self._as_arrays(annual_payment, time, compounding_frequency)
+            codes = self._error_codes(
+                (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+                (time <= 0, ErrorCode.INVALID_TIME),
+                (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+            return self._finish(annual_payment * nominal_rate.annuity_factor(time, compounding_frequency), codes, return_errors)
+
+        annual_payment, nominal_rate, time, compounding_frequency = self._as_arrays(annual_payment, nominal_rate, time, compounding_frequency)
+        codes = self._error_codes(
+            (annual_payment < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (time <= 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        result = AnnuityFactors(nominal_rate, compounding_frequency, time).present_value_annuity(annual_payment)
+        return self._finish(result, codes, return_errors)
+
+    # Cash Payment of an Annuity (Given PV)
+    def cash_payment_annuity_pv(self, present_value, nominal_rate, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the cash payments of annuities given their present values and variable compounding.
+
+        Parameters:
+        - present_value (array_like): The present values of the annuities
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The cash payments of the annuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        present_value, nominal_rate, time, compounding_frequency = self._as_arrays(present_value, nominal_rate, time, compounding_frequency)
+        codes = self._error_codes(
+            (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (time <= 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        result = AnnuityFactors(nominal_rate, compounding_frequency, time).cash_payment_annuity_pv(present_value)
+        return self._finish(result, codes, return_errors)
+
+    # Cash Payment of an Annuity (Given FV)
+    def cash_payment_annuity_fv(self, future_value, nominal_rate, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the cash payments of annuities given their future values and variable compounding.
+
+        Parameters:
+        - future_value (array_like): The future values of the annuities
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The cash payments of the annuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        future_value, nominal_rate, time, compounding_frequency = self._as_arrays(future_value, nominal_rate, time, compounding_frequency)
+        codes = self._error_codes(
+            (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (time <= 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        result = AnnuityFactors(nominal_rate, compounding_frequency, time).cash_payment_annuity_fv(future_value)
+        return self._finish(result, codes, return_errors)
+
+    # Number of Years Annuity (Given PV)
+    def number_of_years_annuity_pv(self, present_value, annual_payment, nominal_rate, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the number of years for annuities given their present values and variable compounding.
+
+        Parameters:
+        - present_value (array_like): The present values of the annuities
+        - annual_payment (array_like): The payments received each year
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The number of years for the annuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        present_value, annual_payment, nominal_rate, compounding_frequency = self._as_arrays(present_value, annual_payment, nominal_rate, compounding_frequency)
+        codes = self._error_codes(
+            (present_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (annual_payment <= 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        result = AnnuityFactors(nominal_rate, compounding_frequency).number_of_years_annuity_pv(present_value, annual_payment)
+        return self._finish(result, codes, return_errors)
+
+    # Number of Years Annuity (Given FV)
+    def number_of_years_annuity_fv(self, future_value, annual_payment, nominal_rate, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the number of years for annuities given their future values and variable compounding.
+
+        Parameters:
+        - future_value (array_like): The future values of the annuities
+        - annual_payment (array_like): The payments received each year
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The number of years for the annuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        future_value, annual_payment, nominal_rate, compounding_frequency = self._as_arrays(future_value, annual_payment, nominal_rate, compounding_frequency)
+        codes = self._error_codes(
+            (future_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (annual_payment <= 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        result = AnnuityFactors(nominal_rate, compounding_frequency).number_of_years_annuity_fv(future_value, annual_payment)
+        return self._finish(result, codes, return_errors)
+
+    # Future Value of an Annuity
+    def future_value_annuity(self, annual_payment, nominal_rate, time, compounding_frequency=1, return_errors=False):
+        """
+        Calculate the future value of annuities with variable compounding.
+
+        Parameters:
+        - annual_payment (array_like): The payments received each year
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - time (array_like): The time periods in years
+        - compounding_frequency (array_like): Number of compounding periods per year. Default is 1 (annually).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The future values of the annuities, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        annual_payment, nominal_rate, time, compounding_frequency = self._as_arrays(annual_payment, nominal_rate, time, compounding_frequency)
+        codes = self._error_codes(
+            (annual_payment <= 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (time <= 0, ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY))
+
+        result = AnnuityFactors(nominal_rate, compounding_frequency, time).future_value_annuity(annual_payment)
+        return self._finish(result, codes, return_errors)
+
+    # Present Value of a Growing Annuity or Perpetuity
+    def present_value_growing_stream(self, payment, nominal_rate, growth=0.0, time=np.inf, compounding_frequency=1, due=False, deferral=0.0, return_errors=False):
+        """
+        Calculate present values of growing annuities and perpetuities, ordinary or due, optionally deferred,
+        in one pass: mix perpetuities (time np.inf), annuities, annuities due and growing streams row by row.
+
+        Parameters:
+        - payment (array_like): The first payments
+        - nominal_rate (array_like): The annual interest rates (as decimals)
+        - growth (array_like): Annual payment growth rates (as decimals), applied per payment period. Default is 0.
+        - time (array_like): Terms in years; np.inf for perpetuities. Default is np.inf.
+        - compounding_frequency (array_like): Number of payments and compounding periods per year. Default is 1 (annually).
+        - due (array_like): Truthy where payments are at the start of each period. Default is False.
+        - deferral (array_like): Years before each stream starts. Default is 0.
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The present values, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        payment, nominal_rate, growth, time, compounding_frequency, due, deferral = self._as_arrays(
+            payment, nominal_rate, growth, time, compounding_frequency, due, deferral)
+        codes = self._error_codes(
+            (payment < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (growth <= -compounding_frequency, ErrorCode.INVALID_RATE),
+            ((time <= 0) | (deferral < 0), ErrorCode.INVALID_TIME),
+            (compounding_frequency <= 0, ErrorCode.INVALID_FREQUENCY),
+            (np.isinf(time) & (nominal_rate <= growth), ErrorCode.RATE_NOT_ABOVE_GROWTH))
+
+        result = payment * growing_stream_factor(nominal_rate, growth, time, compounding_frequency, due != 0, deferral)
+        return self._finish(result, codes, return_errors)
+
+    # Fisher Effect
+    def fisher_effect(self, nominal_rate, inflation_rate, return_errors=False):
+        """
+        Calculate real interest rates using the Fisher Effect.
+
+        Parameters:
+        - nominal_rate (array_like): The nominal interest rates (as decimals)
+        - inflation_rate (array_like): The inflation rates (as decimals)
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The real interest rates (as decimals), NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        nominal_rate, inflation_rate = self._as_arrays(nominal_rate, inflation_rate)
+        codes = self._error_codes(
+            (nominal_rate < 0, ErrorCode.INVALID_RATE),
+            (inflation_rate < 0, ErrorCode.INVALID_RATE))
+
+        with np.errstate(all="ignore"):
+            result = ((1 + nominal_rate) / (1 + inflation_rate)) - 1
+        return self._finish(result, codes, return_errors)
+
+    # Dividend Discount Model
+    def dividend_discount_model(self, dividend, nominal_rate, growth, return_errors=False):
+        """
+        Calculate intrinsic values of stocks using the Dividend Discount Model.
+
+        Parameters:
+        - dividend (array_like): The dividend payments per share
+        - nominal_rate (array_like): The required rates of return (as decimals)
+        - growth (array_like): The dividend growth rates (as decimals)
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The intrinsic values, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        dividend, nominal_rate, growth = self._as_arrays(dividend, nominal_rate, growth)
+        codes = self._error_codes(
+            (dividend < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= growth, ErrorCode.RATE_NOT_ABOVE_GROWTH))
+
+        result = dividend * growing_stream_factor(nominal_rate, growth)
+        return self._finish(result, codes, return_errors)
+
+    # Multi Stage DDM
+    def multi_stage_ddm_with_terminal_value(self, dividends, nominal_rate, terminal_value, lengths=None, return_errors=False):
+        """
+        Calculate intrinsic values of many stocks using a Multi-Stage Dividend Discount Model with a terminal value.
+
+        Cumulative discount factors are built once per stock with a running product over the
+        years, so the whole portfolio is valued in a single pass.
+
+        Parameters:
+        - dividends (array_like): Dividend matrix of shape (stocks, years); a 1-D array is a single stock
+        - nominal_rate (array_like or YieldCurve): The annual discount rate per stock (as decimals), or one curve to discount every stock off
+        - terminal_value (array_like): The estimated stock price per stock at the end of its last dividend year
+        - lengths (array_like): Number of dividend years per stock for ragged schedules; entries past a stock's length are ignored. Default is None (every stock uses all years).
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The intrinsic value per stock, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        dividends = np.asarray(dividends, dtype=np.float64)
+        single_stock = dividends.ndim == 1
+        dividends = np.atleast_2d(dividends)
+        stocks, years = dividends.shape
+
+        curve = nominal_rate if _is_curve(nominal_rate) else None
+        if curve is not None:
+            # Only the sign check below sees this placeholder; discounting uses the curve
+            nominal_rate = 1.0
+        nominal_rate, terminal_value = (np.broadcast_to(np.asarray(arg, dtype=np.float64), (stocks,)) for arg in (nominal_rate, terminal_value))
+        if lengths is None:
+            lengths = np.full(stocks, years, dtype=np.intp)
+        else:
+            lengths = np.broadcast_to(np.asarray(lengths, dtype=np.intp), (stocks,))
+            if np.any((lengths < 0) | (lengths > years)):
+                raise ValueError("lengths must be between 0 and the number of dividend columns")
+
+        in_schedule = np.arange(years) < lengths[:, None]
+        dividends = np.where(in_schedule, dividends, 0.0)
+
+        codes = self._error_codes(
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE),
+            (terminal_value <= 0, ErrorCode.INVALID_AMOUNT),
+            (np.any(dividends < 0, axis=1), ErrorCode.INVALID_AMOUNT))
+
+        if curve is not None:
+            discount = curve.discount_factor(np.arange(years + 1, dtype=np.float64), assume_sorted=True)
+            result = dividends @ discount[1:] + terminal_value * discount[lengths]
+            if single_stock:
+                result, codes = result[0], codes[0]
+            return self._finish(result, codes, return_errors)
+
+        with np.errstate(all="ignore"):
+            # growth[:, i] == (1 + nominal_rate) ** (i + 1), with a leading column of ones for year 0
+            growth = np.ones((stocks, years + 1))
+            np.cumprod(np.broadcast_to((1 + nominal_rate)[:, None], (stocks, years)), axis=1, out=growth[:, 1:])
+            result = np.sum(dividends / growth[:, 1:], axis=1)
+            result += terminal_value / growth[np.arange(stocks), lengths]
+
+        if single_stock:
+            result, codes = result[0], codes[0]
+        return self._finish(result, codes, return_errors)
+
+    # DDM No Growth
+    def ddm_no_growth(self, dividend, nominal_rate, return_errors=False):
+        """
+        Calculate intrinsic values of stocks using the Dividend Discount Model with no growth.
+
+        Parameters:
+        - dividend (array_like): The dividend payments per share
+        - nominal_rate (array_like): The required rates of return (as decimals)
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The intrinsic values, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        dividend, nominal_rate = self._as_arrays(dividend, nominal_rate)
+        codes = self._error_codes(
+            (dividend < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= 0, ErrorCode.INVALID_RATE))
+
+        with np.errstate(all="ignore"):
+            result = dividend / nominal_rate
+        return self._finish(result, codes, return_errors)
+
+    # DDM Constant Growth
+    def ddm_constant_growth(self, dividend, nominal_rate, growth, time, return_errors=False):
+        """
+        Calculate intrinsic values of stocks using the Dividend Discount Model with constant growth over time.
+
+        Parameters:
+        - dividend (array_like): The dividend payments per share
+        - nominal_rate (array_like): The required rates of return (as decimals)
+        - growth (array_like): The dividend growth rates (as decimals)
+        - time (array_like): The time periods in years
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The intrinsic values, NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        dividend, nominal_rate, growth, time = self._as_arrays(dividend, nominal_rate, growth, time)
+        codes = self._error_codes(
+            (dividend < 0, ErrorCode.INVALID_AMOUNT),
+            (nominal_rate <= growth, ErrorCode.RATE_NOT_ABOVE_GROWTH),
+            (time <= 0, ErrorCode.INVALID_TIME))
+
+        # A growing perpetuity whose first dividend is the one paid after time years of growth
+        with np.errstate(all="ignore"):
+            result = dividend * (1 + growth) ** time * growing_stream_factor(nominal_rate, growth)
+        return self._finish(result, codes, return_errors)
+
+    # Holding Period Return
+    def holding_period_return(self, initial_price, final_price, dividend, times_recieved_div, return_errors=False):
+        """
+        Calculate holding period returns for stocks.
+
+        Parameters:
+        - initial_price (array_like): The initial prices of the stocks
+        - final_price (array_like): The final prices of the stocks
+        - dividend (array_like): The dividends received per payment
+        - times_recieved_div (array_like): The number of dividend payments received
+        - return_errors (bool): Also return the ErrorCode array. Default is False.
+
+        Returns:
+        ndarray: The holding period returns (as decimals), NaN where the inputs are invalid (and the ErrorCode array if return_errors)
+        """
+        initial_price, final_price, dividend, times_recieved_div = self._as_arrays(initial_price, final_price, dividend, times_recieved_div)
+        codes = self._error_codes(
+            (initial_price <= 0, ErrorCode.INVALID_AMOUNT),
+            (final_price < 0, ErrorCode.INVALID_AMOUNT),
+            (dividend < 0, ErrorCode.INVALID_AMOUNT))
+
+        with np.errstate(all="ignore"):
+            result = (final_price - initial_price + dividend * times_recieved_div) / initial_price
+        return self._finish(result, codes, return_errors)
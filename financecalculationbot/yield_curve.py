@@ -0,0 +1,171 @@
+import numpy as np
+
+#Term structure with precomputed interpolation tables
+
+class YieldCurve:
+    """
+    Zero-rate curve that can be passed to the valuation methods in place of a flat nominal_rate.
+
+    Zero rates are interpolated linearly or with a monotone cubic (Fritsch-Carlson / PCHIP)
+    and extrapolated flat beyond the first and last knots. The per-segment polynomial
+    coefficients are computed once at construction, so a lookup is a searchsorted into the
+    knot times followed by one Horner evaluation for the whole array of dates.
+    """
+    INTERPOLATIONS = ("linear", "monotone_cubic")
+
+    def __init__(self, times, zero_rates, interpolation="linear", compounding_frequency=1):
+        """
+        Parameters:
+        - times (array_like): Knot maturities in years, strictly increasing
+        - zero_rates (array_like): Zero rates at the knots (as decimals)
+        - interpolation (str): "linear" or "monotone_cubic". Default is "linear".
+        - compounding_frequency (int): Compounding of the zero rates; discount factors are (1 + z / m) ** (-t * m). Default is 1 (annually).
+        """
+        times = np.asarray(times, dtype=np.float64)
+        zero_rates = np.asarray(zero_rates, dtype=np.float64)
+        if times.ndim != 1 or times.shape != zero_rates.shape or times.size == 0:
+            raise ValueError("times and zero_rates must be 1-D arrays of the same non-zero length")
+        if np.any(np.diff(times) <= 0):
+            raise ValueError("times must be strictly increasing")
+        if interpolation not in self.INTERPOLATIONS:
+            raise ValueError(f"interpolation must be one of {self.INTERPOLATIONS}")
+        if compounding_frequency <= 0:
+            raise ValueError("compounding_frequency should be greater than 0")
+
+        self.times = times
+        self.zero_rates = zero_rates
+        self.interpolation = interpolation
+        self.compounding_frequency = compounding_frequency
+        self._coefficients = self._build_coefficients()
+
+    @classmethod
+    def from_discount_factors(cls, times, discount_factors, interpolation="linear", compounding_frequency=1):
+        """
+        Build a curve from discount factors, converting them to zero rates at the knots.
+
+        Parameters:
+        - times (array_like): Knot maturities in years, strictly increasing and greater than 0
+        - discount_factors (array_like): Discount factors at the knots
+        - interpolation (str): "linear" or "monotone_cubic". Default is "linear".
+        - compounding_frequency (int): Compounding of the implied zero rates. Default is 1 (annually).
+
+        Returns:
+        YieldCurve: The curve
+        """
+        times = np.asarray(times, dtype=np.float64)
+        discount_factors = np.asarray(discount_factors, dtype=np.float64)
+        if np.any(times <= 0) or np.any(discount_factors <= 0):
+            raise ValueError("times and discount_factors must be greater than 0")
+        zero_rates = compounding_frequency * (discount_factors ** (-1 / (times * compounding_frequency)) - 1)
+        return cls(times, zero_rates, interpolation, compounding_frequency)
+
+    def _build_coefficients(self):
+        # Row k holds (c0, c1, c2, c3) of z(t) = c0 + c1 s + c2 s^2 + c3 s^3, s = t - times[k]
+        times, rates = self.times, self.zero_rates
+        coefficients = np.zeros((max(times.size - 1, 1), 4))
+        coefficients[:, 0] = rates[:-1] if times.size > 1 else rates
+        if times.size == 1:
+            return coefficients
+
+        widths = np.diff(times)
+        slopes = np.diff(rates) / widths
+        if self.interpolation == "linear":
+            coefficients[:, 1] = slopes
+            return coefficients
+
+        # Fritsch-Carlson knot derivatives: weighted harmonic mean of neighbouring slopes, 0 at extrema
+        derivatives = np.empty(times.size)
+        derivatives[0], derivatives[-1] = slopes[0], slopes[-1]
+        if times.size > 2:
+            left, right = slopes[:-1], slopes[1:]
+            w1 = 2 * widths[1:] + widths[:-1]
+            w2 = widths[1:] + 2 * widths[:-1]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                harmonic = (w1 + w2) / (w1 / left + w2 / right)
+            derivatives[1:-1] = np.where(left * right > 0, harmonic, 0.0)
+
+        coefficients[:, 1] = derivatives[:-1]
+        coefficients[:, 2] = (3 * slopes - 2 * derivatives[:-1] - derivatives[1:]) / widths
+        coefficients[:, 3] = (derivatives[:-1] + derivatives[1:] - 2 * slopes) / widths ** 2
+        return coefficients
+
+    def _segments(self, t, assume_sorted):
+        last = self._coefficients.shape[0] - 1
+        if not assume_sorted:
+            return np.clip(np.searchsorted(self.times, t, side="right") - 1, 0, last)
+        # Sorted dates: locate the few knots inside the date array instead of every date inside the knots
+        boundaries = np.searchsorted(t, self.times[1:-1], side="left")
+        counts = np.diff(np.concatenate(([0], boundaries, [t.size])))
+        return np.repeat(np.arange(last + 1), counts)
+
+    def zero_rate(self, t, assume_sorted=False):
+        """
+        Interpolated zero rates.
+
+        Parameters:
+        - t (array_like): Maturities in years
+        - assume_sorted (bool): t is a sorted 1-D array, which allows a faster segment lookup. Default is False.
+
+        Returns:
+        ndarray: The zero rates (a float for scalar t)
+        """
+        scalar = np.ndim(t) == 0
+        t = np.asarray(t, dtype=np.float64)
+        flat = t.ravel()
+        clipped = np.clip(flat, self.times[0], self.times[-1])
+        segments = self._segments(clipped, assume_sorted and t.ndim == 1)
+        c0, c1, c2, c3 = self._coefficients[segments].T
+        s = clipped - self.times[segments]
+        rates = (c0 + s * (c1 + s * (c2 + s * c3))).reshape(t.shape)
+        return float(rates) if scalar else rates
+
+    def discount_factor(self, t, assume_sorted=False):
+        """
+        Discount factors (1 + z(t) / m) ** (-t * m) for maturities t.
+
+        Parameters:
+        - t (array_like): Maturities in years; millions of dates are handled in one vectorized lookup
+        - assume_sorted (bool): t is a sorted 1-D array, which allows a faster segment lookup. Default is False.
+
+        Returns:
+        ndarray: The discount factors (a float for scalar t)
+        """
+        scalar = np.ndim(t) == 0
+        t = np.asarray(t, dtype=np.float64)
+        rates = self.zero_rate(t, assume_sorted)
+        factors = (1 + rates / self.compounding_frequency) ** (-t * self.compounding_frequency)
+        return float(factors) if scalar else factors
+
+    def shifted(self, shift):
+        """
+        Returns:
+        YieldCurve: A copy with every zero rate moved by shift (a parallel shift)
+        """
+        return YieldCurve(self.times, self.zero_rates + shift, self.interpolation, self.compounding_frequency)
+
+    def annuity_factor(self, time, compounding_frequency=1):
+        """
+        Sum of discount factors for payments at 1/m, 2/m, ..., time years, i.e. the curve's
+        counterpart of (1 - (1 + r/m) ** (-time * m)) / (r/m).
+
+        A cumulative sum of discount factors is built once per distinct frequency and indexed
+        by each row's number of payments, so mixed terms cost one lookup each.
+
+        Parameters:
+        - time (array_like): Annuity terms in years; time * compounding_frequency is rounded to whole payments
+        - compounding_frequency (array_like): Number of payments per year. Default is 1 (annually).
+
+        Returns:
+        ndarray: The annuity factors (a float for scalar inputs)
+        """
+        scalar = np.ndim(time) == 0 and np.ndim(compounding_frequency) == 0
+        time, compounding_frequency = np.broadcast_arrays(np.asarray(time, dtype=np.float64), np.asarray(compounding_frequency, dtype=np.float64))
+        periods = np.rint(np.where(time > 0, time * compounding_frequency, 0)).astype(np.int64)
+        factors = np.zeros(time.shape)
+        for frequency in np.unique(compounding_frequency[compounding_frequency > 0]):
+            rows = compounding_frequency == frequency
+            longest = int(periods[rows].max(initial=0))
+            payment_times = np.arange(1, longest + 1) / frequency
+            cumulative = np.concatenate(([0.0], np.cumsum(self.discount_factor(payment_times, assume_sorted=True))))
+            factors[rows] = cumulative[periods[rows]]
+        return float(factors) if scalar else factors